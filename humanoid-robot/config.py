@@ -1,9 +1,19 @@
 import os
 
 class Config:
+    # Hardware backend: 'real' on the robot, 'sim' to run headless off-robot
+    HAL_BACKEND = os.getenv('ANU_HAL_BACKEND', 'real')
+    SIM_SPEED = float(os.getenv('ANU_SIM_SPEED', '1.0'))     # 1.0 = real time, 0 = as fast as possible
+    SIM_CAMERA_VIDEO = os.getenv('ANU_SIM_CAMERA_VIDEO', '')  # Video file; empty for blank frames
+    SIM_MICROPHONE_WAV = os.getenv('ANU_SIM_MICROPHONE_WAV', '')  # 16 kHz mono WAV; empty for silence
+    SIM_ULTRASONIC_DISTANCE_CM = 100
+    SIM_SERVO_WRITE_SECONDS = 0.0005  # Approximate PCA9685 I2C write time
+    
     # Hardware settings
     PCA9685_ADDRESS = 0x40
     SERVO_COUNT = 17
+    # [forward, backward] BCM pins per motor; BCM 0-3 are the ID EEPROM and
+    # the servo driver's I2C bus, so the real backend refuses them
     MOTOR_PINS = {
         'front_left': [1, 2],
         'front_right': [3, 4],
@@ -19,12 +29,18 @@ class Config:
     # Vision settings
     FACE_RECOGNITION_MODEL = 'hog'  # Use 'cnn' for better accuracy but slower
     OBJECT_DETECTION_MODEL = 'yolov8n'
+    YOLO_INPUT_SIZE = 640
     FACE_DATABASE_PATH = os.path.join('data', 'faces')
+    PRESENCE_ENTER_FRAMES = 2         # Consecutive sightings before someone "enters"
+    PRESENCE_LEAVE_SECONDS = 3.0      # Unseen time before someone "leaves"
+    GREETING_COOLDOWN_SECONDS = 300   # Don't greet the same person again within this
+    PRESENCE_UNKNOWN_MATCH_PIXELS = 80  # Max face-center movement between frames for the same stranger
     
     # LLM settings
     OFFLINE_LLM_PATH = os.path.join('models', 'llm', 'tinyllama-1.1b')
     ONLINE_LLM_PROVIDER = 'gemini'  # Options: gemini, perplexity, deepseek
     ONLINE_LLM_API_KEY = os.getenv('LLM_API_KEY', '')
+    LLM_THREADS = 4  # Threads used while generating
     
     # Motion settings
     SERVO_RANGES = {
@@ -37,7 +53,55 @@ class Config:
     ULTRASONIC_PINS = {'trigger': 23, 'echo': 24}
     PIR_PINS = [25, 26]
     TEMP_SENSOR_PIN = 27
+    OBSTACLE_STOP_CM = 20         # An obstacle closer than this is an emergency
+    OBSTACLE_CLEAR_CM = 30        # ...which only clears once it is this far away
+    EMERGENCY_CLEAR_READINGS = 3  # Consecutive safe readings before an emergency ends
     
     # Performance settings
     VISION_PROCESSING_FPS = 5  # Lower FPS to reduce CPU load
-    LLM_CONTEXT_LENGTH = 512   # Shorter context for faster processing
\ No newline at end of file
+    LLM_CONTEXT_LENGTH = 512   # Shorter context for faster processing
+    MODEL_LOADER_WORKERS = 3   # Models (speech, vision, LLM) load concurrently at startup
+    TRACE_EXPORT_PATH = os.getenv('ANU_TRACE_EXPORT', '')  # Chrome trace JSON written on shutdown
+    
+    # Monitoring: Prometheus metrics and on-demand profiling over local HTTP
+    METRICS_HOST = '127.0.0.1'
+    # 9100 is node_exporter's, which often runs on the same board; 0 disables the endpoint
+    METRICS_PORT = int(os.getenv('ANU_METRICS_PORT', '9777'))
+    PROFILE_OUTPUT_DIR = os.path.join('data', 'profiles')
+    
+    # Adaptive quality governor
+    # Knobs the governor may change at runtime, best quality first. The values
+    # above are the best it will pick; it only degrades from there.
+    QUALITY_KNOBS = {
+        'VISION_PROCESSING_FPS': [5, 3, 2, 1],
+        'YOLO_INPUT_SIZE': [640, 480, 320],
+        'FACE_RECOGNITION_MODEL': ['cnn', 'hog'],  # Only moves if configured as 'cnn'
+        'LLM_THREADS': [4, 3, 2]
+    }
+    GOVERNOR_INTERVAL = 0.5                  # Seconds between adjustments
+    GOVERNOR_TEMP_THRESHOLDS = [65, 75, 80]  # °C for warm / hot / critical (Pi 5 throttles at 80-85)
+    GOVERNOR_TEMP_MARGIN = 5                 # °C below a threshold before stepping back down
+    GOVERNOR_LOAD_THRESHOLDS = [0.9, 1.2, 1.6]  # Load average per core
+    GOVERNOR_LOAD_MARGIN = 0.2
+    GOVERNOR_BATTERY_THRESHOLDS = [30, 20, 10]  # Percent remaining
+    GOVERNOR_BATTERY_MARGIN = 5
+    GOVERNOR_RELAX_SECONDS = 10              # Minimum time between relaxing pressure levels
+    CONVERSATION_TIMEOUT_SECONDS = 20        # How long after an utterance a conversation counts as active
+    
+    # Inter-module channels: name -> (max depth, policy when full)
+    CHANNELS = {
+        'speech': (16, 'drop_oldest'),
+        'vision': (4, 'drop_oldest'),      # Per-frame results; only the latest matter
+        'presence': (32, 'never_drop'),    # Enter/leave events, one per arrival or departure
+        'llm': (8, 'drop_oldest'),
+        'reply': (8, 'never_drop'),        # LLM answers someone is waiting to hear
+        'motion': (16, 'block'),           # Never lose a movement command
+        'sensor': (8, 'drop_oldest'),      # Only the latest reading matters
+        'emergency': (64, 'never_drop')    # Safety critical, always delivered
+    }
+    
+    # Module supervision
+    SUPERVISOR_HEARTBEAT_SECONDS = 30  # How often to print module health
+    SUPERVISOR_BASE_BACKOFF = 0.5      # First restart delay after a crash
+    SUPERVISOR_MAX_BACKOFF = 30.0      # Upper bound on restart delay
+    SUPERVISOR_STALL_SECONDS = 60.0    # Flag a module with no heartbeat for this long
\ No newline at end of file
@@ -0,0 +1,44 @@
+import importlib
+import threading
+from hal.motors import GPIOMotorController
+
+# Backend name (Config.HAL_BACKEND) -> module providing the create_* functions
+BACKENDS = {
+    'real': 'hal.real',
+    'sim': 'hal.simulated'
+}
+
+_lock = threading.Lock()
+_gpio = {}
+
+def get_backend(config):
+    """Import the backend module selected in Config"""
+    backend = config.HAL_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown HAL backend: {backend}")
+    return importlib.import_module(BACKENDS[backend])
+
+def create_gpio(config):
+    """Get the GPIO interface; shared, since sensors and motors use one chip"""
+    with _lock:
+        if config.HAL_BACKEND not in _gpio:
+            _gpio[config.HAL_BACKEND] = get_backend(config).create_gpio(config)
+        return _gpio[config.HAL_BACKEND]
+
+def create_servo_kit(config):
+    """Get the PCA9685 servo driver"""
+    return get_backend(config).create_servo_kit(config)
+
+def create_motor_controller(config):
+    """Get the wheel motor controller on top of the selected GPIO"""
+    return GPIOMotorController(
+        create_gpio(config), config.MOTOR_PINS, get_backend(config).RESERVED_PINS
+    )
+
+def create_camera(config):
+    """Get a camera with a cv2.VideoCapture-style read()/release()"""
+    return get_backend(config).create_camera(config)
+
+def create_microphone(config):
+    """Get a microphone with open(rate, chunk_size) -> stream.read(frames)"""
+    return get_backend(config).create_microphone(config)
@@ -0,0 +1,63 @@
+class GPIOMotorController:
+    """Drive the four wheel motors through an H-bridge on GPIO pins.
+
+    Each motor in Config.MOTOR_PINS has a [forward, backward] pin pair;
+    speed (0-1) is applied as PWM duty cycle on the active pin. Works with
+    any GPIO backend from the HAL, real or simulated. Pins are BCM numbers;
+    any in `reserved_pins` (pin -> what it is used for) are rejected.
+    """
+
+    PWM_FREQUENCY = 1000  # Hz
+
+    def __init__(self, gpio, motor_pins, reserved_pins=None):
+        self.gpio = gpio
+        self.motor_pins = motor_pins
+
+        conflicts = [
+            f"{motor} uses BCM {pin} ({reserved_pins[pin]})"
+            for motor, pins in self.motor_pins.items()
+            for pin in pins
+            if pin in (reserved_pins or {})
+        ]
+        if conflicts:
+            raise ValueError(
+                "MOTOR_PINS would drive PWM on reserved GPIO pins: " + "; ".join(conflicts)
+                + ". Set Config.MOTOR_PINS to the BCM pins the H-bridge is wired to."
+            )
+
+        self.gpio.setmode(self.gpio.BCM)
+        self.pwm = {}
+        for pins in self.motor_pins.values():
+            for pin in pins:
+                self.gpio.setup(pin, self.gpio.OUT)
+                self.pwm[pin] = self.gpio.PWM(pin, self.PWM_FREQUENCY)
+                self.pwm[pin].start(0)
+
+    def drive(self, directions, speed):
+        """Drive each motor: 1 forward, -1 backward, 0 stopped"""
+        duty = max(0.0, min(1.0, speed)) * 100
+        for motor, (forward_pin, backward_pin) in self.motor_pins.items():
+            direction = directions.get(motor, 0)
+            self.pwm[forward_pin].ChangeDutyCycle(duty if direction > 0 else 0)
+            self.pwm[backward_pin].ChangeDutyCycle(duty if direction < 0 else 0)
+
+    def move_forward(self, speed):
+        self.drive({motor: 1 for motor in self.motor_pins}, speed)
+
+    def move_backward(self, speed):
+        self.drive({motor: -1 for motor in self.motor_pins}, speed)
+
+    def turn_left(self, speed):
+        self.drive({
+            'front_left': -1, 'back_left': -1,
+            'front_right': 1, 'back_right': 1
+        }, speed)
+
+    def turn_right(self, speed):
+        self.drive({
+            'front_left': 1, 'back_left': 1,
+            'front_right': -1, 'back_right': -1
+        }, speed)
+
+    def stop(self):
+        self.drive({}, 0)
@@ -0,0 +1,63 @@
+import importlib
+
+# BCM pins the motors must not drive: the PCA9685 servo driver sits on I2C1
+# and the HAT ID EEPROM on I2C0
+RESERVED_PINS = {
+    0: 'ID_SD, HAT ID EEPROM',
+    1: 'ID_SC, HAT ID EEPROM',
+    2: 'SDA1, servo driver I2C bus',
+    3: 'SCL1, servo driver I2C bus'
+}
+
+def create_gpio(config):
+    """Raspberry Pi GPIO"""
+    return importlib.import_module('RPi.GPIO')
+
+def create_servo_kit(config):
+    """PCA9685 servo driver over I2C"""
+    from adafruit_servokit import ServoKit
+    return ServoKit(channels=16, address=config.PCA9685_ADDRESS)
+
+def create_camera(config):
+    """First attached camera"""
+    import cv2
+    camera = cv2.VideoCapture(0)
+    camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+    camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+    camera.set(cv2.CAP_PROP_FPS, config.VISION_PROCESSING_FPS)
+    return camera
+
+class PyAudioMicrophone:
+    """Default input device via PyAudio"""
+
+    def __init__(self):
+        import pyaudio
+        self.pyaudio = pyaudio
+        self.audio = pyaudio.PyAudio()
+
+    def open(self, rate, chunk_size):
+        """Open a 16-bit mono input stream"""
+        return PyAudioStream(self.audio.open(
+            format=self.pyaudio.paInt16,
+            channels=1,
+            rate=rate,
+            input=True,
+            frames_per_buffer=chunk_size
+        ))
+
+    def terminate(self):
+        self.audio.terminate()
+
+class PyAudioStream:
+    def __init__(self, stream):
+        self.stream = stream
+
+    def read(self, frames):
+        return self.stream.read(frames, exception_on_overflow=False)
+
+    def close(self):
+        self.stream.stop_stream()
+        self.stream.close()
+
+def create_microphone(config):
+    return PyAudioMicrophone()
@@ -0,0 +1,290 @@
+import threading
+import time
+import wave
+from collections import deque
+
+SPEED_OF_SOUND_CM_PER_SEC = 34300
+RESERVED_PINS = {}  # No I2C bus to protect
+
+class Pacer:
+    """Spaces out calls to simulate a device producing data in real time.
+
+    speed 1.0 is real time, 2.0 twice as fast, and 0 disables pacing so
+    recorded input is replayed as fast as the consumer can take it.
+    """
+
+    def __init__(self, speed=1.0):
+        self.speed = speed
+        self.next_time = None
+
+    def wait(self, period):
+        if not self.speed:
+            return
+        now = time.time()
+        if self.next_time is None or self.next_time < now:
+            self.next_time = now
+        delay = self.next_time - now
+        if delay > 0:
+            time.sleep(delay)
+        self.next_time += period / self.speed
+
+class SimulatedPWM:
+    def __init__(self, gpio, pin, frequency):
+        self.gpio = gpio
+        self.pin = pin
+        self.frequency = frequency
+
+    def start(self, duty_cycle):
+        self.ChangeDutyCycle(duty_cycle)
+
+    def ChangeDutyCycle(self, duty_cycle):
+        self.gpio.duty_cycles[self.pin] = duty_cycle
+
+    def ChangeFrequency(self, frequency):
+        self.frequency = frequency
+
+    def stop(self):
+        self.gpio.duty_cycles[self.pin] = 0
+
+class SimulatedGPIO:
+    """Stand-in for RPi.GPIO with a simulated HC-SR04 ultrasonic sensor.
+
+    Pulsing the trigger pin arms an echo pulse whose width matches
+    `distance_cm`, so SensorManager's timing loop runs unchanged. The pulse
+    starts at the first echo read after the trigger rather than at a fixed
+    time, so a reader that loses the CPU can't miss it. Other inputs (e.g.
+    PIR) read whatever set_input() last set.
+    """
+
+    BCM = 'BCM'
+    BOARD = 'BOARD'
+    OUT = 'OUT'
+    IN = 'IN'
+    HIGH = 1
+    LOW = 0
+
+    def __init__(self, trigger_pin=None, echo_pin=None, distance_cm=100.0):
+        self.trigger_pin = trigger_pin
+        self.echo_pin = echo_pin
+        self.distance_cm = distance_cm
+
+        self.lock = threading.Lock()
+        self.mode = None
+        self.directions = {}
+        self.levels = {}
+        self.duty_cycles = {}
+        self.echo_width = None  # Armed by the trigger, started by the next echo read
+        self.echo_end = None
+
+    def setmode(self, mode):
+        self.mode = mode
+
+    def setwarnings(self, enabled):
+        pass
+
+    def setup(self, pin, direction, **kwargs):
+        self.directions[pin] = direction
+        self.levels.setdefault(pin, self.LOW)
+
+    def output(self, pin, value):
+        with self.lock:
+            previous = self.levels.get(pin, self.LOW)
+            self.levels[pin] = self.HIGH if value else self.LOW
+
+            # Falling edge on the trigger arms an echo pulse
+            if pin == self.trigger_pin and previous and not value:
+                self.echo_width = 2 * self.distance_cm / SPEED_OF_SOUND_CM_PER_SEC
+                self.echo_end = None
+
+    def input(self, pin):
+        if pin == self.echo_pin:
+            with self.lock:
+                now = time.time()
+                if self.echo_width is not None:
+                    self.echo_end = now + self.echo_width
+                    self.echo_width = None
+                if self.echo_end is not None and now < self.echo_end:
+                    return self.HIGH
+                self.echo_end = None
+                return self.LOW
+        return self.levels.get(pin, self.LOW)
+
+    def set_input(self, pin, value):
+        """Drive a simulated input pin"""
+        self.levels[pin] = self.HIGH if value else self.LOW
+
+    def set_distance(self, distance_cm):
+        """Move the simulated obstacle"""
+        self.distance_cm = distance_cm
+
+    def PWM(self, pin, frequency):
+        return SimulatedPWM(self, pin, frequency)
+
+    def cleanup(self):
+        with self.lock:
+            self.directions.clear()
+            self.levels.clear()
+            self.duty_cycles.clear()
+
+class SimulatedServo:
+    def __init__(self, kit, channel):
+        self.kit = kit
+        self.channel = channel
+        self._angle = None
+
+    @property
+    def angle(self):
+        return self._angle
+
+    @angle.setter
+    def angle(self, value):
+        self.kit.record_write(self.channel, value)
+        self._angle = value
+
+class SimulatedServoKit:
+    """Fake PCA9685 ServoKit that records every servo write with its time.
+
+    `write_seconds` simulates the I2C transaction so motion code sees
+    realistic per-write cost.
+    """
+
+    def __init__(self, channels=16, address=0x40, write_seconds=0.0, history=10000):
+        self.address = address
+        self.write_seconds = write_seconds
+        self.servo = [SimulatedServo(self, channel) for channel in range(channels)]
+
+        self.lock = threading.Lock()
+        self.writes = deque(maxlen=history)  # (timestamp, channel, angle)
+        self.write_count = 0
+
+    def record_write(self, channel, angle):
+        if self.write_seconds:
+            time.sleep(self.write_seconds)
+        with self.lock:
+            self.writes.append((time.time(), channel, angle))
+            self.write_count += 1
+
+    def stats(self):
+        """Get write count and the interval between recent writes"""
+        with self.lock:
+            writes = list(self.writes)
+            write_count = self.write_count
+
+        intervals = [b[0] - a[0] for a, b in zip(writes, writes[1:])]
+        return {
+            'writes': write_count,
+            'mean_interval': sum(intervals) / len(intervals) if intervals else None,
+            'max_interval': max(intervals) if intervals else None,
+            'angles': {servo.channel: servo.angle for servo in self.servo}
+        }
+
+class VideoFileCamera:
+    """Camera that replays a video file in a loop, paced to its frame rate"""
+
+    def __init__(self, path, speed=1.0):
+        import cv2
+        self.cv2 = cv2
+        self.capture = cv2.VideoCapture(path)
+        if not self.capture.isOpened():
+            raise ValueError(f"Cannot open simulated camera video: {path}")
+
+        self.fps = self.capture.get(cv2.CAP_PROP_FPS) or 30.0
+        self.pacer = Pacer(speed)
+
+    def read(self):
+        self.pacer.wait(1 / self.fps)
+        ret, frame = self.capture.read()
+        if not ret:
+            # Loop back to the start of the file
+            self.capture.set(self.cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.capture.read()
+        return ret, frame
+
+    def set(self, prop, value):
+        return False
+
+    def release(self):
+        self.capture.release()
+
+class SyntheticCamera:
+    """Camera producing blank 640x480 frames when no video is configured"""
+
+    def __init__(self, fps=30.0, speed=1.0):
+        import numpy as np
+        self.frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        self.fps = fps
+        self.pacer = Pacer(speed)
+
+    def read(self):
+        self.pacer.wait(1 / self.fps)
+        return True, self.frame.copy()
+
+    def set(self, prop, value):
+        return False
+
+    def release(self):
+        pass
+
+class WavMicrophone:
+    """Microphone that plays back a 16-bit mono WAV file (or silence)"""
+
+    def __init__(self, path='', speed=1.0):
+        self.path = path
+        self.speed = speed
+
+    def open(self, rate, chunk_size):
+        return WavStream(self.path, rate, self.speed)
+
+    def terminate(self):
+        pass
+
+class WavStream:
+    def __init__(self, path, rate, speed):
+        self.rate = rate
+        self.pacer = Pacer(speed)
+        self.wav = None
+
+        if path:
+            self.wav = wave.open(path, 'rb')
+            if (self.wav.getframerate() != rate or self.wav.getnchannels() != 1
+                    or self.wav.getsampwidth() != 2):
+                self.wav.close()
+                raise ValueError(f"Simulated microphone needs a {rate} Hz 16-bit mono WAV: {path}")
+
+    def read(self, frames):
+        self.pacer.wait(frames / self.rate)
+        if self.wav is None:
+            return bytes(frames * 2)
+
+        data = self.wav.readframes(frames)
+        if len(data) < frames * 2:
+            # Loop back to the start of the file
+            self.wav.rewind()
+            data += self.wav.readframes(frames - len(data) // 2)
+        return data
+
+    def close(self):
+        if self.wav is not None:
+            self.wav.close()
+
+def create_gpio(config):
+    return SimulatedGPIO(
+        trigger_pin=config.ULTRASONIC_PINS['trigger'],
+        echo_pin=config.ULTRASONIC_PINS['echo'],
+        distance_cm=config.SIM_ULTRASONIC_DISTANCE_CM
+    )
+
+def create_servo_kit(config):
+    return SimulatedServoKit(
+        channels=16,
+        address=config.PCA9685_ADDRESS,
+        write_seconds=config.SIM_SERVO_WRITE_SECONDS
+    )
+
+def create_camera(config):
+    if config.SIM_CAMERA_VIDEO:
+        return VideoFileCamera(config.SIM_CAMERA_VIDEO, config.SIM_SPEED)
+    return SyntheticCamera(speed=config.SIM_SPEED)
+
+def create_microphone(config):
+    return WavMicrophone(config.SIM_MICROPHONE_WAV, config.SIM_SPEED)
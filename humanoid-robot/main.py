@@ -2,30 +2,90 @@ import threading
 import time
 import queue
 from config import Config
-from modules.speech.speech_processor import SpeechProcessor
-from modules.vision.vision_processor import VisionProcessor
-from modules.llm.llm_processor import LLMProcessor
-from modules.motion.motion_controller import MotionController
-from modules.sensors.sensor_manager import SensorManager
+from utils.startup import startup_timeline, ModelLoader
+
+# Safety-critical modules first; model-backed modules defer their heavy imports
+with startup_timeline.span('sensors', 'import module'):
+    from modules.sensors.sensor_manager import SensorManager
+with startup_timeline.span('motion', 'import module'):
+    from modules.motion.motion_controller import MotionController
+with startup_timeline.span('speech', 'import module'):
+    from modules.speech.speech_processor import SpeechProcessor
+with startup_timeline.span('vision', 'import module'):
+    from modules.vision.vision_processor import VisionProcessor
+with startup_timeline.span('llm', 'import module'):
+    from modules.llm.llm_processor import LLMProcessor
+
+from modules.governor.quality_governor import QualityGovernor
+from utils.world_state import WorldState
+from utils.channels import create_channels
+from utils.supervisor import Supervisor, heartbeat
+from utils.tracing import tracer
+from utils.metrics import registry, LoopTimer
+from utils.metrics_server import MetricsServer
+from utils import system_stats
 
 class HumanoidRobot:
     def __init__(self):
         self.config = Config()
         self.running = False
         
-        # Initialize message queues
-        self.speech_queue = queue.Queue()
-        self.vision_queue = queue.Queue()
-        self.llm_queue = queue.Queue()
-        self.motion_queue = queue.Queue()
-        self.sensor_queue = queue.Queue()
+        # Initialize bounded message channels (sizes and policies in Config.CHANNELS)
+        self.channels = create_channels(self.config)
+        self.speech_queue = self.channels['speech']
+        self.vision_queue = self.channels['vision']
+        self.presence_queue = self.channels['presence']
+        self.llm_queue = self.channels['llm']
+        self.reply_queue = self.channels['reply']
+        self.motion_queue = self.channels['motion']
+        self.sensor_queue = self.channels['sensor']
+        self.emergency_queue = self.channels['emergency']
+        
+        # Shared world state; modules publish snapshots, readers never block
+        self.world_state = WorldState({
+            'location': 'unknown',  # Could integrate with sensors
+            'people_present': (),
+            'unknown_people': 0,
+            'emergency_active': False,  # Motion refuses to move while set
+            'battery_level': 'unknown'
+        })
+        
+        # Stage 1: safety-critical sensors and motion come up synchronously
+        with startup_timeline.span('sensors', 'init'):
+            self.sensor_manager = SensorManager(
+                self.sensor_queue, self.config, self.world_state, self.emergency_queue
+            )
+        with startup_timeline.span('motion', 'init'):
+            self.motion_controller = MotionController(self.motion_queue, self.config, self.world_state)
+        
+        # Stage 2: model-backed modules return immediately and load concurrently
+        self.model_loader = ModelLoader(startup_timeline, self.config.MODEL_LOADER_WORKERS)
+        self.speech_processor = SpeechProcessor(self.speech_queue, self.config, self.model_loader)
+        self.vision_processor = VisionProcessor(
+            self.vision_queue, self.config, self.world_state, self.model_loader, self.presence_queue
+        )
+        self.llm_processor = LLMProcessor(
+            self.llm_queue, self.config, self.model_loader, self.reply_queue
+        )
+        
+        # Trades quality for latency when the board is hot, busy or low on battery
+        self.quality_governor = QualityGovernor(
+            self.config, self.sensor_manager, self.llm_processor, self.world_state
+        )
+        self.llm_processor.thread_budget = self.quality_governor.llm_threads
+        
+        # Restarts crashed module threads and reports their health
+        self.supervisor = Supervisor(
+            heartbeat_interval=self.config.SUPERVISOR_HEARTBEAT_SECONDS,
+            base_backoff=self.config.SUPERVISOR_BASE_BACKOFF,
+            max_backoff=self.config.SUPERVISOR_MAX_BACKOFF,
+            stall_seconds=self.config.SUPERVISOR_STALL_SECONDS,
+            channels=self.channels
+        )
         
-        # Initialize modules
-        self.speech_processor = SpeechProcessor(self.speech_queue, self.config)
-        self.vision_processor = VisionProcessor(self.vision_queue, self.config)
-        self.llm_processor = LLMProcessor(self.llm_queue, self.config)
-        self.motion_controller = MotionController(self.motion_queue, self.config)
-        self.sensor_manager = SensorManager(self.sensor_queue, self.config)
+        # Monitoring endpoint (started with the robot)
+        self.metrics_server = None
+        self.setup_metrics()
         
         # Priority system
         self.priority_levels = {
@@ -40,19 +100,22 @@ class HumanoidRobot:
         """Start all modules"""
         self.running = True
         
-        # Start modules in separate threads
-        threads = [
-            threading.Thread(target=self.speech_processor.run),
-            threading.Thread(target=self.vision_processor.run),
-            threading.Thread(target=self.llm_processor.run),
-            threading.Thread(target=self.motion_controller.run),
-            threading.Thread(target=self.sensor_manager.run),
-            threading.Thread(target=self.main_loop)
-        ]
+        # Safety-critical modules and the decision loop start first
+        self.supervisor.add('sensors', self.sensor_manager.run)
+        self.supervisor.add('motion', self.motion_controller.run)
+        self.supervisor.add('main_loop', self.main_loop)
+        self.supervisor.start()
         
-        for thread in threads:
-            thread.daemon = True
-            thread.start()
+        # Model-backed modules report "warming up" until their models are loaded
+        self.supervisor.add('speech', self.speech_processor.run)
+        self.supervisor.add('vision', self.vision_processor.run)
+        self.supervisor.add('llm', self.llm_processor.run)
+        self.supervisor.add('governor', self.quality_governor.run)
+        
+        threading.Thread(target=self.report_startup, daemon=True).start()
+        
+        if self.config.METRICS_PORT:
+            self.start_metrics_server()
         
         print("Humanoid Robot started. Press Ctrl+C to stop.")
         try:
@@ -61,30 +124,121 @@ class HumanoidRobot:
         except KeyboardInterrupt:
             self.stop()
     
+    def start_metrics_server(self):
+        """Serve /metrics; the robot runs on without it if the port is taken"""
+        try:
+            self.metrics_server = MetricsServer(
+                registry,
+                host=self.config.METRICS_HOST,
+                port=self.config.METRICS_PORT,
+                profile_dir=self.config.PROFILE_OUTPUT_DIR
+            )
+        except OSError as e:
+            print(
+                f"Metrics disabled: cannot listen on "
+                f"{self.config.METRICS_HOST}:{self.config.METRICS_PORT} ({e})"
+            )
+            return
+        self.metrics_server.start()
+    
+    def setup_metrics(self):
+        """Register metrics sampled at scrape time and fed from trace spans"""
+        channel_depth = registry.gauge('robot_channel_depth', 'Messages waiting in a channel')
+        channel_dropped = registry.counter('robot_channel_dropped_total', 'Messages dropped by a full channel')
+        channel_blocked = registry.counter('robot_channel_blocked_total', 'Puts that waited on a full channel')
+        module_up = registry.gauge('robot_module_up', 'Whether a supervised module thread is running')
+        module_stalled = registry.gauge('robot_module_stalled', 'Whether a module has stopped sending heartbeats')
+        module_restarts = registry.counter('robot_module_restarts_total', 'Supervisor restarts after a crash')
+        thread_cpu = registry.counter('robot_thread_cpu_seconds_total', 'CPU time used per thread')
+        rss = registry.gauge('robot_process_resident_memory_bytes', 'Resident memory of the robot process')
+        soc_temperature = registry.gauge('robot_soc_temperature_celsius', 'SoC temperature')
+        stage_seconds = registry.histogram('robot_stage_seconds', 'Duration of traced pipeline stages')
+        llm_tokens_per_second = registry.gauge('robot_llm_tokens_per_second', 'Offline LLM generation speed')
+        
+        def collect():
+            for name, channel in self.channels.items():
+                stats = channel.stats()
+                channel_depth.set(stats['depth'], channel=name)
+                channel_dropped.set_total(stats['dropped'], channel=name)
+                channel_blocked.set_total(stats['blocked'], channel=name)
+            for name, info in self.supervisor.status().items():
+                module_up.set(1 if info['alive'] else 0, module=name)
+                module_stalled.set(1 if info['stalled'] else 0, module=name)
+                module_restarts.set_total(info['restarts'], module=name)
+            for name, seconds in system_stats.read_thread_cpu_seconds().items():
+                thread_cpu.set_total(seconds, thread=name)
+            rss.set(system_stats.read_rss_bytes())
+            temperature = system_stats.read_cpu_temperature()
+            if temperature is not None:
+                soc_temperature.set(temperature)
+        
+        def on_span(stage, duration, args):
+            stage_seconds.observe(duration, stage=stage)
+            if stage == 'llm_total' and args.get('tokens') and duration > 0:
+                llm_tokens_per_second.set(args['tokens'] / duration)
+        
+        registry.add_collector(collect)
+        tracer.add_listener(on_span)
+    
+    def report_startup(self):
+        """Print the startup timeline once every model has loaded"""
+        self.model_loader.wait_all()
+        print(startup_timeline.report())
+        for component, state in self.model_loader.status().items():
+            if state != 'ready':
+                print(f"{component}: {state}")
+    
     def main_loop(self):
         """Main decision-making loop"""
+        loop_timer = LoopTimer('main_loop', 0.01)
         while self.running:
+            heartbeat('main_loop')
+            loop_timer.tick(time.time())
+            
             # Check for highest priority task
             tasks = []
             
-            # Check sensor queue for emergencies
-            if not self.sensor_queue.empty():
-                sensor_data = self.sensor_queue.get()
-                if self.is_emergency(sensor_data):
-                    self.handle_emergency(sensor_data)
-                    continue
+            # Emergencies have their own channel and are handled first
+            emergency_data = self.poll(self.emergency_queue)
+            if emergency_data is not None:
+                self.handle_emergency(emergency_data)
+                continue
+            
+            # Sensors without an emergency channel flag the first reading of one
+            sensor_data = self.poll(self.sensor_queue)
+            if sensor_data is not None and sensor_data.get('emergency'):
+                self.handle_emergency(sensor_data)
+                continue
+            
+            # Keep everything stopped for as long as the emergency lasts;
+            # only its first reading is announced
+            if sensor_data is not None and sensor_data.get('emergency_active'):
+                self.motion_controller.emergency_stop()
             
             # Check for motion commands
-            if not self.motion_queue.empty():
-                tasks.append(('motion', self.motion_queue.get()))
+            motion_command = self.poll(self.motion_queue)
+            if motion_command is not None:
+                tasks.append(('motion', motion_command))
             
             # Check for speech input
-            if not self.speech_queue.empty():
-                tasks.append(('speech', self.speech_queue.get()))
+            speech_data = self.poll(self.speech_queue)
+            if speech_data is not None:
+                tasks.append(('speech', speech_data))
+            
+            # Check for LLM answers to speak
+            reply_data = self.poll(self.reply_queue)
+            if reply_data is not None:
+                tasks.append(('reply', reply_data))
+            
+            # Check for people arriving or leaving
+            presence_data = self.poll(self.presence_queue)
+            if presence_data is not None:
+                tasks.append(('presence', presence_data))
             
             # Check for vision input
-            if not self.vision_queue.empty():
-                tasks.append(('vision', self.vision_queue.get()))
+            vision_data = self.poll(self.vision_queue)
+            if vision_data is not None:
+                tasks.append(('vision', vision_data))
             
             # Process tasks by priority
             if tasks:
@@ -96,14 +250,12 @@ class HumanoidRobot:
             
             time.sleep(0.01)  # Prevent CPU overload
     
-    def is_emergency(self, sensor_data):
-        """Check if sensor data indicates an emergency"""
-        # Implement emergency detection logic
-        if sensor_data.get('obstacle_too_close', False):
-            return True
-        if sensor_data.get('temperature_high', False):
-            return True
-        return False
+    def poll(self, channel):
+        """Take one message from a channel without blocking, or None"""
+        try:
+            return channel.get_nowait()
+        except queue.Empty:
+            return None
     
     def handle_emergency(self, emergency_data):
         """Handle emergency situations"""
@@ -119,6 +271,10 @@ class HumanoidRobot:
         """Process different types of tasks"""
         if task_type == 'speech':
             self.process_speech(task_data)
+        elif task_type == 'reply':
+            self.process_reply(task_data)
+        elif task_type == 'presence':
+            self.process_presence(task_data)
         elif task_type == 'vision':
             self.process_vision(task_data)
         elif task_type == 'motion':
@@ -128,33 +284,49 @@ class HumanoidRobot:
         """Process speech commands"""
         text = speech_data.get('text', '')
         confidence = speech_data.get('confidence', 0)
+        trace = speech_data.get('trace')
         
         if confidence > self.config.MIN_CONFIDENCE:
+            self.world_state.publish(last_utterance=time.time())
+            
             # Check if this is a motion command
-            motion_command = self.parse_motion_command(text)
+            with tracer.span('intent_parse', trace):
+                motion_command = self.parse_motion_command(text)
             if motion_command:
+                motion_command['trace'] = trace
                 self.motion_queue.put(motion_command)
             else:
                 # Send to LLM for processing
                 self.llm_queue.put({
                     'type': 'query',
                     'text': text,
-                    'context': self.get_current_context()
+                    'context': self.get_current_context(),
+                    'trace': trace
                 })
     
+    def process_reply(self, reply_data):
+        """Speak an LLM answer"""
+        self.speech_processor.speak(reply_data['text'], reply_data.get('trace'))
+    
+    def process_presence(self, presence_data):
+        """Greet people as they arrive"""
+        for event in presence_data.get('presence_events', []):
+            if event['event'] != 'enter' or not event['greet']:
+                continue
+            
+            if event['recognized']:
+                # Greet known person
+                greeting = f"Hello {event['name']}, nice to see you again."
+                self.speech_processor.speak(greeting, presence_data.get('trace'))
+            else:
+                # Ask for introduction
+                self.speech_processor.speak(
+                    "I don't recognize you. Could you please tell me your name?",
+                    presence_data.get('trace')
+                )
+    
     def process_vision(self, vision_data):
         """Process vision data"""
-        # Handle face recognition
-        if 'faces' in vision_data:
-            for face in vision_data['faces']:
-                if face['recognized']:
-                    # Greet known person
-                    greeting = f"Hello {face['name']}, nice to see you again."
-                    self.speech_processor.speak(greeting)
-                else:
-                    # Ask for introduction
-                    self.speech_processor.speak("I don't recognize you. Could you please tell me your name?")
-        
         # Handle object detection
         if 'objects' in vision_data:
             # Process detected objects
@@ -189,21 +361,28 @@ class HumanoidRobot:
     
     def get_current_context(self):
         """Get current context for LLM"""
-        return {
-            'location': 'unknown',  # Could integrate with sensors
-            'people_present': self.vision_processor.get_detected_people(),
-            'time': time.strftime("%H:%M"),
-            'battery_level': self.sensor_manager.get_battery_level()
-        }
+        # Latest published snapshot; the prompt fills in the time itself
+        return self.world_state.current().data
     
     def stop(self):
         """Stop all modules gracefully"""
         self.running = False
+        self.supervisor.stop()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
         self.speech_processor.stop()
         self.vision_processor.stop()
         self.llm_processor.stop()
+        self.quality_governor.stop()
         self.motion_controller.stop()
         self.sensor_manager.stop()
+        self.model_loader.shutdown()
+        
+        # Per-stage latency summary, plus a Chrome trace if requested
+        print(tracer.format_summary())
+        if self.config.TRACE_EXPORT_PATH:
+            tracer.export_chrome_trace(self.config.TRACE_EXPORT_PATH)
+            print(f"Trace written to {self.config.TRACE_EXPORT_PATH}")
         print("Humanoid Robot stopped.")
 
 if __name__ == "__main__":
@@ -0,0 +1,189 @@
+import time
+from utils import system_stats
+from utils.metrics import registry
+from utils.supervisor import heartbeat
+
+PRESSURE = registry.gauge('robot_governor_pressure', 'Governor pressure level (0 normal .. 3 critical)')
+QUALITY_LEVEL = registry.gauge('robot_quality_level', 'Governor degradation level per knob (0 = best)')
+
+class HysteresisLevel:
+    """Maps a signal to a level 0..len(thresholds) with a dead band.
+
+    The level rises as soon as the signal reaches the next threshold but
+    only falls once it drops `margin` below the current one, so a signal
+    hovering at a threshold doesn't flip the level every tick.
+    """
+
+    def __init__(self, thresholds, margin):
+        self.thresholds = thresholds
+        self.margin = margin
+        self.level = 0
+
+    def update(self, value):
+        if value is None:
+            return self.level
+        while self.level < len(self.thresholds) and value >= self.thresholds[self.level]:
+            self.level += 1
+        while self.level > 0 and value < self.thresholds[self.level - 1] - self.margin:
+            self.level -= 1
+        return self.level
+
+class Knob:
+    """A Config setting the governor may move between declared levels.
+
+    `levels` run from best quality to cheapest. The configured value is
+    the best the governor will ever choose, so it only degrades from there.
+    """
+
+    def __init__(self, config, name, levels):
+        self.config = config
+        self.name = name
+        self.levels = levels
+        current = getattr(config, name)
+        self.baseline = levels.index(current) if current in levels else 0
+        self.index = self.baseline
+
+    def target(self, degradation):
+        return min(len(self.levels) - 1, self.baseline + degradation)
+
+    def apply(self, index):
+        """Set the knob to a level; returns True if the value changed"""
+        if index == self.index:
+            return False
+        self.index = index
+        setattr(self.config, self.name, self.levels[index])
+        return True
+
+class QualityGovernor:
+    """Adjusts quality knobs at runtime from temperature, load and battery.
+
+    Pressure (0-3) is the worst of the thermal, load and battery levels and
+    buys a number of degradation steps. A step on a knob already at its
+    cheapest level (e.g. a face model configured as 'hog') is skipped
+    rather than wasted. Which knobs those steps hit depends
+    on what the robot is doing: during a conversation vision is degraded
+    first so ASR and the LLM keep their latency. An idle LLM uses no CPU, so
+    outside a conversation only vision gives up quality. While the LLM is
+    generating, vision drops to its lowest FPS, and each generation starts
+    with the thread count from `llm_threads()`.
+    """
+
+    # Order in which knobs give up quality, per activity
+    CONVERSATION_PLAN = [
+        'VISION_PROCESSING_FPS', 'VISION_PROCESSING_FPS', 'YOLO_INPUT_SIZE',
+        'VISION_PROCESSING_FPS', 'YOLO_INPUT_SIZE', 'FACE_RECOGNITION_MODEL',
+        'LLM_THREADS', 'LLM_THREADS'
+    ]
+    IDLE_PLAN = [
+        'YOLO_INPUT_SIZE', 'VISION_PROCESSING_FPS', 'FACE_RECOGNITION_MODEL',
+        'YOLO_INPUT_SIZE', 'VISION_PROCESSING_FPS', 'VISION_PROCESSING_FPS'
+    ]
+    # Degradation steps allowed at each pressure level
+    STEP_BUDGET = [0, 2, 5, len(CONVERSATION_PLAN)]
+
+    def __init__(self, config, sensor_manager, llm_processor, world_state):
+        self.config = config
+        self.sensor_manager = sensor_manager
+        self.llm_processor = llm_processor
+        self.world_state = world_state
+        self.running = False
+
+        self.knobs = {
+            name: Knob(config, name, levels)
+            for name, levels in self.config.QUALITY_KNOBS.items()
+        }
+
+        self.thermal = HysteresisLevel(self.config.GOVERNOR_TEMP_THRESHOLDS, self.config.GOVERNOR_TEMP_MARGIN)
+        self.load = HysteresisLevel(self.config.GOVERNOR_LOAD_THRESHOLDS, self.config.GOVERNOR_LOAD_MARGIN)
+        # Battery is inverted (percent used) so higher is worse like the others
+        self.battery = HysteresisLevel(
+            [100 - level for level in self.config.GOVERNOR_BATTERY_THRESHOLDS],
+            self.config.GOVERNOR_BATTERY_MARGIN
+        )
+
+        self.pressure = 0
+        self.last_relax = 0
+
+    def run(self):
+        """Run the governor in a separate thread"""
+        self.running = True
+
+        print("Quality governor started.")
+        while self.running:
+            heartbeat('governor')
+            self.update(time.time())
+            time.sleep(self.config.GOVERNOR_INTERVAL)
+
+    def read_battery_used(self):
+        """Battery used in percent, from SensorManager's "80%"-style reading"""
+        try:
+            return 100 - float(str(self.sensor_manager.get_battery_level()).rstrip('%'))
+        except ValueError:
+            return None
+
+    def update(self, now):
+        """Recompute pressure and apply knob levels"""
+        pressure = max(
+            self.thermal.update(system_stats.read_cpu_temperature()),
+            self.load.update(system_stats.read_load_average()),
+            self.battery.update(self.read_battery_used())
+        )
+
+        # Escalate immediately, relax one level at a time
+        if pressure > self.pressure:
+            self.pressure = pressure
+            self.last_relax = now
+        elif pressure < self.pressure and now - self.last_relax >= self.config.GOVERNOR_RELAX_SECONDS:
+            self.pressure -= 1
+            self.last_relax = now
+        PRESSURE.set(self.pressure)
+
+        generating = self.llm_processor.generating
+        last_utterance = self.world_state.get('last_utterance')
+        conversation = generating or (
+            last_utterance is not None
+            and now - last_utterance < self.config.CONVERSATION_TIMEOUT_SECONDS
+        )
+        plan = self.CONVERSATION_PLAN if conversation else self.IDLE_PLAN
+
+        degradation = self.degradation(plan)
+        targets = {name: knob.target(degradation[name]) for name, knob in self.knobs.items()}
+        if generating:
+            # Yield the CPU to the LLM while it is producing a reply
+            if 'VISION_PROCESSING_FPS' in self.knobs:
+                targets['VISION_PROCESSING_FPS'] = len(self.knobs['VISION_PROCESSING_FPS'].levels) - 1
+
+        for name, knob in self.knobs.items():
+            if knob.apply(targets[name]):
+                print(f"Governor: {name} -> {knob.levels[knob.index]} (pressure {self.pressure})")
+            QUALITY_LEVEL.set(knob.index, knob=name)
+
+    def degradation(self, plan):
+        """Steps each knob gives up under `plan` at the current pressure"""
+        degradation = {name: 0 for name in self.knobs}
+        budget = self.STEP_BUDGET[self.pressure]
+        for name in plan:
+            if budget == 0:
+                break
+            knob = self.knobs.get(name)
+            if knob is None or knob.target(degradation[name] + 1) == knob.target(degradation[name]):
+                continue
+            degradation[name] += 1
+            budget -= 1
+        return degradation
+
+    def llm_threads(self):
+        """Thread count for a generation starting now.
+
+        A generation is always part of a conversation, so this uses the
+        conversation plan at the current pressure, never more than the
+        configured LLM_THREADS.
+        """
+        knob = self.knobs.get('LLM_THREADS')
+        if knob is None:
+            return self.config.LLM_THREADS
+        return knob.levels[knob.target(self.degradation(self.CONVERSATION_PLAN)['LLM_THREADS'])]
+
+    def stop(self):
+        """Stop the governor"""
+        self.running = False
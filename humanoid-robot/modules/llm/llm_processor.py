@@ -1,20 +1,34 @@
 import threading
+import time
+import queue
 import requests
-from llama_cpp import Llama
+from utils.startup import lazy_import, default_loader, load_status
+from utils.tracing import tracer
+from utils.supervisor import heartbeat
+
+# Heavy imports happen in the background loader, not at import time
+llama_cpp = lazy_import('llama_cpp')
+
+WARMING_UP_REPLY = "I'm still warming up. Please ask me again in a moment."
+UNAVAILABLE_REPLY = "Sorry, my language model failed to load, so I can't answer that."
 
 class LLMProcessor:
-    def __init__(self, output_queue, config):
+    def __init__(self, output_queue, config, loader=None, reply_queue=None):
         self.output_queue = output_queue
         self.config = config
         self.running = False
         
-        # Initialize offline LLM
-        self.offline_llm = Llama(
-            model_path=self.config.OFFLINE_LLM_PATH,
-            n_ctx=self.config.LLM_CONTEXT_LENGTH,
-            n_threads=4,  # Use 4 threads for better performance
-            verbose=False
-        )
+        # Answers go back to main_loop, which owns TTS
+        self.reply_queue = reply_queue
+        
+        # Offline LLM loads in the background; queries fall back until ready
+        self.offline_llm = None
+        self.n_threads = self.config.LLM_THREADS
+        self.generating = False  # True while the offline LLM is producing tokens
+        # Called before each generation for the thread count (e.g. the quality governor)
+        self.thread_budget = None
+        self.loader = loader or default_loader()
+        self.models_ready = self.loader.submit('llm', self.load_models)
         
         # Online LLM settings
         self.online_providers = {
@@ -23,41 +37,109 @@ class LLMProcessor:
             'deepseek': self.query_deepseek
         }
     
+    def load_models(self):
+        """Import llama.cpp and load the offline LLM (runs in the loader)"""
+        timeline = self.loader.timeline
+        timeline.import_module('llm', llama_cpp)
+        
+        # Initialize offline LLM
+        with timeline.span('llm', 'load tinyllama'):
+            self.offline_llm = llama_cpp.Llama(
+                model_path=self.config.OFFLINE_LLM_PATH,
+                n_ctx=self.config.LLM_CONTEXT_LENGTH,
+                n_threads=self.n_threads,  # Adjusted at runtime by the quality governor
+                verbose=False
+            )
+    
     def run(self):
         """Run LLM processing in a separate thread"""
         self.running = True
         
         print("LLM processor started.")
         while self.running:
-            # This would typically process from an input queue
-            # For now, we'll just wait for calls
-            time.sleep(0.1)
+            heartbeat('llm')
+            try:
+                request = self.output_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            
+            if request.get('type') != 'query':
+                continue
+            
+            trace = request.get('trace')
+            response = self.process_query(request['text'], request['context'], trace=trace)
+            if response and self.reply_queue is not None:
+                self.reply_queue.put({'type': 'reply', 'text': response, 'trace': trace})
     
-    def process_query(self, query, context, use_online=True):
+    def process_query(self, query, context, use_online=True, trace=None):
         """Process a query with LLM"""
         if use_online and self.config.ONLINE_LLM_API_KEY:
+            # A failed attempt gets its own stage so the offline answer is
+            # the query's only llm_total
+            start = time.perf_counter()
             try:
-                return self.query_online(query, context)
+                response = self.query_online(query, context)
             except Exception as e:
+                tracer.record('llm_online_failed', trace, start, time.perf_counter())
                 print(f"Online LLM failed: {e}. Falling back to offline.")
+            else:
+                tracer.record('llm_total', trace, start, time.perf_counter(), backend='online')
+                return response
         
         # Use offline LLM
-        return self.query_offline(query, context)
+        return self.query_offline(query, context, trace)
     
-    def query_offline(self, query, context):
+    def query_offline(self, query, context, trace=None):
         """Query offline LLM"""
+        if self.offline_llm is None:
+            if load_status(self.models_ready) == 'failed':
+                print(f"Offline LLM unavailable: {self.models_ready.exception()!r}")
+                return UNAVAILABLE_REPLY
+            return WARMING_UP_REPLY
+        
         prompt = self.build_prompt(query, context)
         
-        response = self.offline_llm(
-            prompt,
-            max_tokens=150,
-            temperature=0.7,
-            top_p=0.9,
-            echo=False,
-            stop=["Human:", "AI:"]
-        )
+        # Ask for the thread count now rather than trusting one set while idle
+        self.set_threads(self.thread_budget() if self.thread_budget else self.config.LLM_THREADS)
+        
+        # Stream so time to first token can be measured
+        start = time.perf_counter()
+        first_token = None
+        parts = []
+        self.generating = True
+        try:
+            for chunk in self.offline_llm(
+                prompt,
+                max_tokens=150,
+                temperature=0.7,
+                top_p=0.9,
+                echo=False,
+                stop=["Human:", "AI:"],
+                stream=True
+            ):
+                heartbeat('llm')  # A long reply is progress, not a stall
+                if first_token is None:
+                    first_token = time.perf_counter()
+                    tracer.record('llm_first_token', trace, start, first_token)
+                parts.append(chunk['choices'][0]['text'])
+        finally:
+            self.generating = False
+        
+        tracer.record('llm_total', trace, start, time.perf_counter(), backend='offline', tokens=len(parts))
+        
+        return ''.join(parts).strip()
+    
+    def set_threads(self, n_threads):
+        """Change how many CPU threads the offline LLM uses"""
+        if self.offline_llm is None or n_threads == self.n_threads:
+            return
         
-        return response['choices'][0]['text'].strip()
+        # llama.cpp reads the thread count from the context on each decode
+        ctx = getattr(getattr(self.offline_llm, '_ctx', None), 'ctx', None)
+        if ctx is not None and hasattr(llama_cpp, 'llama_set_n_threads'):
+            llama_cpp.llama_set_n_threads(ctx, n_threads, n_threads)
+        self.offline_llm.n_threads = n_threads
+        self.n_threads = n_threads
     
     def query_online(self, query, context):
         """Query online LLM"""
@@ -98,9 +180,10 @@ class LLMProcessor:
     def build_prompt(self, query, context):
         """Build prompt for LLM"""
         prompt = f"""You are a helpful humanoid robot assistant. Here is your current context:
-- Time: {context.get('time', 'unknown')}
+- Time: {context.get('time') or time.strftime("%H:%M")}
 - Location: {context.get('location', 'unknown')}
 - People present: {', '.join(context.get('people_present', [])) or 'None'}
+- Unrecognized people present: {context.get('unknown_people', 0)}
 - Battery level: {context.get('battery_level', 'unknown')}
 
 Human: {query}
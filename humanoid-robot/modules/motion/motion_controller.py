@@ -1,19 +1,31 @@
 import threading
 import time
-from adafruit_servokit import ServoKit
-from utils.motor_controller import MotorController
+import queue
+from hal.factory import create_servo_kit, create_motor_controller
+from utils.tracing import tracer
+from utils.metrics import LoopTimer
+from utils.supervisor import heartbeat
 
 class MotionController:
-    def __init__(self, input_queue, config):
+    def __init__(self, input_queue, config, world_state=None):
         self.input_queue = input_queue
         self.config = config
+        self.world_state = world_state
         self.running = False
         
-        # Initialize servo controller
-        self.servo_kit = ServoKit(channels=16, address=self.config.PCA9685_ADDRESS)
+        # Initialize servo controller (real or simulated, per Config.HAL_BACKEND)
+        self.servo_kit = create_servo_kit(self.config)
+        
+        # Servos past the driver's last channel aren't wired to anything
+        self.servo_channels = min(self.config.SERVO_COUNT, len(self.servo_kit.servo))
+        if self.servo_channels < self.config.SERVO_COUNT:
+            print(
+                f"Warning: {self.config.SERVO_COUNT} servos configured but the driver has "
+                f"{len(self.servo_kit.servo)} channels; servos {self.servo_channels}+ are ignored"
+            )
         
         # Initialize motor controller
-        self.motor_controller = MotorController(self.config.MOTOR_PINS)
+        self.motor_controller = create_motor_controller(self.config)
         
         # Servo positions
         self.servo_positions = [90] * self.config.SERVO_COUNT  # Default to center
@@ -30,17 +42,38 @@ class MotionController:
         self.running = True
         
         print("Motion controller started.")
+        loop_timer = LoopTimer('motion', 0.01)
         while self.running:
-            if not self.input_queue.empty():
-                command = self.input_queue.get()
+            heartbeat('motion')
+            loop_timer.tick(time.time())
+            
+            # The main loop also takes from this channel, so never block on get
+            try:
+                command = self.input_queue.get_nowait()
+            except queue.Empty:
+                command = None
+            
+            if command is not None:
                 self.execute_command(command)
             
             time.sleep(0.01)  # Short sleep to prevent CPU overload
     
     def execute_command(self, command):
         """Execute a motion command"""
+        trace = command.get('trace')
+        with tracer.span('actuation', trace, action=command.get('action')):
+            self.dispatch_command(command)
+        tracer.finish(trace)
+    
+    def dispatch_command(self, command):
+        """Run the handler for a motion command's action"""
         action = command.get('action')
         
+        if action == 'move' and self.emergency_active():
+            print(f"Refusing to move {command.get('direction')}: emergency active")
+            self.stop_motors()
+            return
+        
         if action == 'move':
             self.move(
                 command.get('direction'),
@@ -48,7 +81,7 @@ class MotionController:
                 command.get('speed', 0.5)
             )
         elif action == 'stop':
-            self.stop()
+            self.stop_motors()
         elif action == 'gesture':
             self.execute_gesture(command.get('gesture'))
         elif action == 'pose':
@@ -72,12 +105,19 @@ class MotionController:
         elif direction == 'right':
             self.motor_controller.turn_right(speed)
         
-        # If distance is specified, stop after moving that distance
+        # If distance is specified, stop after moving that distance, or
+        # as soon as an emergency starts
         if distance > 0:
-            time.sleep(self.calculate_move_time(distance, speed))
-            self.stop()
+            end = time.time() + self.calculate_move_time(distance, speed)
+            while time.time() < end and not self.emergency_active():
+                time.sleep(0.02)
+            self.stop_motors()
     
-    def stop(self):
+    def emergency_active(self):
+        """Whether the latest sensor snapshot has an emergency in progress"""
+        return self.world_state is not None and self.world_state.get('emergency_active', False)
+    
+    def stop_motors(self):
         """Stop all motors"""
         self.motor_controller.stop()
     
@@ -97,7 +137,7 @@ class MotionController:
     
     def set_servo(self, servo_id, position, speed=1.0):
         """Set a servo to a specific position with controlled speed"""
-        if servo_id < 0 or servo_id >= self.config.SERVO_COUNT:
+        if servo_id < 0 or servo_id >= self.servo_channels:
             print(f"Invalid servo ID: {servo_id}")
             return
         
@@ -137,9 +177,9 @@ class MotionController:
     
     def emergency_stop(self):
         """Immediately stop all motion"""
-        self.stop()
-        # Set all servos to neutral position quickly
-        for i, pos in enumerate(self.poses['neutral']):
+        self.stop_motors()
+        # Set all servos the driver has channels for to neutral position quickly
+        for i, pos in enumerate(self.poses['neutral'][:self.servo_channels]):
             self.servo_kit.servo[i].angle = pos
             self.servo_positions[i] = pos
     
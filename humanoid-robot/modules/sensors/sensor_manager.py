@@ -1,26 +1,35 @@
 import threading
 import time
-import RPi.GPIO as GPIO
+from types import MappingProxyType
+from hal.factory import create_gpio
+from utils.supervisor import heartbeat
+from utils.tracing import tracer, new_trace
+
+# HC-SR04 echoes last at most ~38 ms (no obstacle in range); past this the echo was missed
+ECHO_TIMEOUT_SECONDS = 0.05
 
 class SensorManager:
-    def __init__(self, output_queue, config):
+    def __init__(self, output_queue, config, world_state=None, emergency_queue=None):
         self.output_queue = output_queue
         self.config = config
+        self.emergency_queue = emergency_queue
+        self.world_state = world_state
         self.running = False
         
-        # Setup GPIO
-        GPIO.setmode(GPIO.BCM)
+        # Setup GPIO (real or simulated, per Config.HAL_BACKEND)
+        self.gpio = create_gpio(self.config)
+        self.gpio.setmode(self.gpio.BCM)
         
         # Setup ultrasonic sensor
-        GPIO.setup(self.config.ULTRASONIC_PINS['trigger'], GPIO.OUT)
-        GPIO.setup(self.config.ULTRASONIC_PINS['echo'], GPIO.IN)
+        self.gpio.setup(self.config.ULTRASONIC_PINS['trigger'], self.gpio.OUT)
+        self.gpio.setup(self.config.ULTRASONIC_PINS['echo'], self.gpio.IN)
         
         # Setup PIR sensors
         for pin in self.config.PIR_PINS:
-            GPIO.setup(pin, GPIO.IN)
+            self.gpio.setup(pin, self.gpio.IN)
         
         # Setup temperature sensor (assuming DHT11)
-        GPIO.setup(self.config.TEMP_SENSOR_PIN, GPIO.IN)
+        self.gpio.setup(self.config.TEMP_SENSOR_PIN, self.gpio.IN)
         
         # Sensor data
         self.sensor_data = {
@@ -29,6 +38,8 @@ class SensorManager:
             'temperature': 0,
             'humidity': 0
         }
+        self.emergency_active = False
+        self.safe_readings = 0
     
     def run(self):
         """Run sensor monitoring in a separate thread"""
@@ -36,35 +47,72 @@ class SensorManager:
         
         print("Sensor manager started.")
         while self.running:
-            # Read all sensors
+            heartbeat('sensors')
+            self.poll_once()
+            time.sleep(0.1)  # Read sensors 10 times per second
+    
+    def poll_once(self):
+        """Read all sensors once and publish the results"""
+        trace = new_trace('sensors')
+        with tracer.span('sensor_read', trace):
             self.read_ultrasonic()
             self.read_pir()
             self.read_temperature()
-            
-            # Check for emergency conditions
-            self.check_emergencies()
-            
-            # Send data to output queue
-            self.output_queue.put(self.sensor_data.copy())
-            
-            time.sleep(0.1)  Read sensors 10 times per second
+        
+        # Check for emergency conditions
+        self.check_emergencies()
+        
+        # An emergency is raised once, when it starts; readings during it are
+        # routine so a lingering obstacle doesn't flood the never-drop channel.
+        # It ends only after several safe readings in a row, so one noisy
+        # echo can't end it and raise it again on the next reading.
+        if self.is_emergency():
+            self.safe_readings = 0
+        else:
+            self.safe_readings += 1
+        started = self.is_emergency() and not self.emergency_active
+        if started:
+            self.emergency_active = True
+        elif self.safe_readings >= self.config.EMERGENCY_CLEAR_READINGS:
+            self.emergency_active = False
+        active = self.emergency_active
+        
+        message = dict(self.sensor_data, emergency=started, emergency_active=active, trace=trace)
+        if started and self.emergency_queue is not None:
+            self.emergency_queue.put(message)
+        else:
+            self.output_queue.put(message)
+        
+        # Publish a read-only copy so other modules never see a half-updated dict
+        if self.world_state is not None:
+            self.world_state.publish(
+                sensors=MappingProxyType(self.sensor_data.copy()),
+                emergency_active=active,
+                battery_level=self.get_battery_level()
+            )
+        return started
     
     def read_ultrasonic(self):
         """Read distance from ultrasonic sensor"""
         # Send trigger pulse
-        GPIO.output(self.config.ULTRASONIC_PINS['trigger'], True)
+        self.gpio.output(self.config.ULTRASONIC_PINS['trigger'], True)
         time.sleep(0.00001)
-        GPIO.output(self.config.ULTRASONIC_PINS['trigger'], False)
+        self.gpio.output(self.config.ULTRASONIC_PINS['trigger'], False)
         
-        # Measure echo pulse duration
+        # Measure echo pulse duration; on a missed echo keep the last reading
         start_time = time.time()
-        stop_time = time.time()
-        
-        while GPIO.input(self.config.ULTRASONIC_PINS['echo']) == 0:
+        deadline = start_time + ECHO_TIMEOUT_SECONDS
+        while self.gpio.input(self.config.ULTRASONIC_PINS['echo']) == 0:
             start_time = time.time()
+            if start_time > deadline:
+                return
         
-        while GPIO.input(self.config.ULTRASONIC_PINS['echo']) == 1:
+        stop_time = start_time
+        deadline = start_time + ECHO_TIMEOUT_SECONDS
+        while self.gpio.input(self.config.ULTRASONIC_PINS['echo']) == 1:
             stop_time = time.time()
+            if stop_time > deadline:
+                return
         
         # Calculate distance
         time_elapsed = stop_time - start_time
@@ -76,7 +124,7 @@ class SensorManager:
         """Read PIR motion sensors"""
         motion_detected = False
         for pin in self.config.PIR_PINS:
-            if GPIO.input(pin):
+            if self.gpio.input(pin):
                 motion_detected = True
                 break
         
@@ -96,11 +144,13 @@ class SensorManager:
     
     def check_emergencies(self):
         """Check for emergency conditions"""
-        # Check if obstacle is too close
-        if self.sensor_data['distance'] < 20:  # 20 cm threshold
-            self.sensor_data['obstacle_too_close'] = True
+        # Check if obstacle is too close; once it is, it has to move back
+        # past OBSTACLE_CLEAR_CM to count as gone
+        if self.sensor_data.get('obstacle_too_close'):
+            threshold = self.config.OBSTACLE_CLEAR_CM
         else:
-            self.sensor_data['obstacle_too_close'] = False
+            threshold = self.config.OBSTACLE_STOP_CM
+        self.sensor_data['obstacle_too_close'] = self.sensor_data['distance'] < threshold
         
         # Check if temperature is too high
         if self.sensor_data['temperature'] > 40:  # 40°C threshold
@@ -108,6 +158,10 @@ class SensorManager:
         else:
             self.sensor_data['temperature_high'] = False
     
+    def is_emergency(self):
+        """Check whether the latest readings are an emergency"""
+        return self.sensor_data['obstacle_too_close'] or self.sensor_data['temperature_high']
+    
     def get_battery_level(self):
         """Get battery level (placeholder)"""
         # Implement actual battery monitoring based on your hardware
@@ -116,4 +170,4 @@ class SensorManager:
     def stop(self):
         """Stop sensor monitoring"""
         self.running = False
-        GPIO.cleanup()
\ No newline at end of file
+        self.gpio.cleanup()
\ No newline at end of file
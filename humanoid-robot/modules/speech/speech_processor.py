@@ -1,70 +1,120 @@
 import threading
 import queue
 import json
-import pyaudio
-import vosk
-from silero_vad import load_silero_vad, apply_silero_vad
-from utils.tts import TextToSpeech
+from utils.startup import lazy_import, default_loader, wait_until_ready, load_status
+from hal.factory import create_microphone
+from utils.tracing import tracer, new_trace
+from utils.supervisor import heartbeat
+
+# Heavy imports happen in the background loader, not at import time
+vosk = lazy_import('vosk')
+silero_vad = lazy_import('silero_vad')
+tts = lazy_import('utils.tts')
 
 class SpeechProcessor:
-    def __init__(self, output_queue, config):
+    def __init__(self, output_queue, config, loader=None):
         self.output_queue = output_queue
         self.config = config
         self.running = False
-        self.audio = pyaudio.PyAudio()
+        
+        # Audio settings
+        self.rate = 16000
+        self.chunk_size = 8000
+        
+        # The TTS engine isn't thread-safe; one utterance at a time
+        self.tts_lock = threading.Lock()
+        
+        # Models load in the background; run() and speak() check readiness
+        self.microphone = None
+        self.vosk_model = None
+        self.vad_model = None
+        self.tts_engine = None
+        self.loader = loader or default_loader()
+        self.models_ready = self.loader.submit('speech', self.load_models)
+    
+    def load_models(self):
+        """Import and load audio, ASR, VAD and TTS (runs in the loader)"""
+        timeline = self.loader.timeline
+        for module in (vosk, silero_vad, tts):
+            timeline.import_module('speech', module)
+        
+        with timeline.span('speech', 'open microphone'):
+            self.microphone = create_microphone(self.config)
         
         # Initialize Vosk model
-        self.vosk_model = vosk.Model(self.config.VOSK_MODEL_PATH)
+        with timeline.span('speech', 'load vosk'):
+            self.vosk_model = vosk.Model(self.config.VOSK_MODEL_PATH)
         
         # Initialize Silero VAD
-        self.vad_model = load_silero_vad(self.config.SILERO_VAD_PATH)
+        with timeline.span('speech', 'load silero vad'):
+            self.vad_model = silero_vad.load_silero_vad(self.config.SILERO_VAD_PATH)
         
         # Initialize TTS
-        self.tts_engine = TextToSpeech()
-        
-        # Audio settings
-        self.rate = 16000
-        self.chunk_size = 8000
-        
+        with timeline.span('speech', 'load tts'):
+            self.tts_engine = tts.TextToSpeech()
+    
+    @property
+    def tts_available(self):
+        """Whether speak() will actually produce audio"""
+        return self.tts_engine is not None
+    
     def run(self):
         """Run speech processing in a separate thread"""
         self.running = True
         
+        if not wait_until_ready(self.models_ready, "Speech processor", lambda: self.running,
+                                on_wait=lambda: heartbeat('speech')):
+            return
+        
         # Start audio stream
-        stream = self.audio.open(
-            format=pyaudio.paInt16,
-            channels=1,
-            rate=self.rate,
-            input=True,
-            frames_per_buffer=self.chunk_size
-        )
+        stream = self.microphone.open(self.rate, self.chunk_size)
         
         rec = vosk.KaldiRecognizer(self.vosk_model, self.rate)
         
         print("Speech processor started. Listening...")
         while self.running:
-            data = stream.read(self.chunk_size, exception_on_overflow=False)
+            heartbeat('speech')
+            # Each chunk starts a trace; it follows the utterance if one is recognized
+            trace = new_trace('speech')
+            with tracer.span('audio_capture', trace):
+                data = stream.read(self.chunk_size)
             
             # Check if speech is detected using VAD
-            if apply_silero_vad(self.vad_model, data):
-                if rec.AcceptWaveform(data):
-                    result = json.loads(rec.Result())
-                    if result['text']:
-                        # Add to output queue
-                        self.output_queue.put({
-                            'type': 'speech',
-                            'text': result['text'],
-                            'confidence': result.get('confidence', 0.5)
-                        })
+            with tracer.span('vad', trace):
+                speech_detected = silero_vad.apply_silero_vad(self.vad_model, data)
+            
+            if speech_detected:
+                with tracer.span('asr', trace):
+                    result = None
+                    if rec.AcceptWaveform(data):
+                        result = json.loads(rec.Result())
+                
+                if result and result['text']:
+                    # Add to output queue
+                    self.output_queue.put({
+                        'type': 'speech',
+                        'text': result['text'],
+                        'confidence': result.get('confidence', 0.5),
+                        'trace': trace
+                    })
         
-        stream.stop_stream()
         stream.close()
     
-    def speak(self, text):
-        """Convert text to speech"""
-        self.tts_engine.speak(text)
+    def speak(self, text, trace=None):
+        """Convert text to speech; callers on other threads wait their turn"""
+        if not self.tts_available:
+            if load_status(self.models_ready) == 'failed':
+                print(f"(TTS unavailable: {self.models_ready.exception()!r}) {text}")
+            else:
+                print(f"(TTS warming up) {text}")
+            return
+        with self.tts_lock:
+            with tracer.span('tts', trace, chars=len(text)):
+                self.tts_engine.speak(text)
+        tracer.finish(trace)
     
     def stop(self):
         """Stop speech processing"""
         self.running = False
-        self.audio.terminate()
\ No newline at end of file
+        if self.microphone is not None:
+            self.microphone.terminate()
\ No newline at end of file
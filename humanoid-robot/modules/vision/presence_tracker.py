@@ -0,0 +1,160 @@
+import itertools
+import math
+import threading
+import time
+
+def _center(location):
+    """Center of a (top, right, bottom, left) face box, or None"""
+    if not location:
+        return None
+    top, right, bottom, left = location
+    return ((left + right) / 2, (top + bottom) / 2)
+
+class PresenceTracker:
+    """Track who is in front of the robot from per-frame face results.
+
+    A person only "enters" after being seen in `enter_frames` consecutive
+    updates and only "leaves" after not being seen for `leave_seconds`, so a
+    single missed detection does not produce a leave/enter pair. Only those
+    transitions are reported; steady-state frames produce no events.
+
+    Recognized faces are keyed by name. Unrecognized faces get their own
+    "unknown-N" track, matched frame to frame by face position, so two
+    strangers are two people and each is asked for their name.
+    """
+
+    def __init__(self, enter_frames=2, leave_seconds=3.0, greeting_cooldown=300.0,
+                 unknown_match_distance=80):
+        self.enter_frames = enter_frames
+        self.leave_seconds = leave_seconds
+        self.greeting_cooldown = greeting_cooldown
+        self.unknown_match_distance = unknown_match_distance
+        self.unknown_ids = itertools.count(1)
+
+        self.lock = threading.Lock()
+
+        # identity -> {'hits', 'first_seen', 'last_seen', 'present', 'recognized'}
+        self.tracks = {}
+        # identity -> time of the last greeting, kept after the person leaves
+        self.last_greeted = {}
+
+        # Immutable views of who is present, replaced only on enter/leave
+        self.present = ()
+        self.unknown_present = 0
+
+    def update(self, faces, now=None):
+        """Update presence from one frame of face results and return events"""
+        if now is None:
+            now = time.time()
+
+        events = []
+        with self.lock:
+            seen = set()
+            for face in faces:
+                identity = self._identify(face, seen, now)
+                if identity in seen:
+                    continue
+                seen.add(identity)
+
+                track = self.tracks.get(identity)
+                if track is None:
+                    track = {
+                        'hits': 0,
+                        'first_seen': now,
+                        'last_seen': now,
+                        'present': False,
+                        'recognized': face['recognized'],
+                        'center': None
+                    }
+                    self.tracks[identity] = track
+
+                track['hits'] += 1
+                track['last_seen'] = now
+                track['center'] = _center(face.get('location'))
+
+                if not track['present'] and track['hits'] >= self.enter_frames:
+                    track['present'] = True
+                    events.append(self._enter_event(identity, track, now))
+
+            for identity, track in list(self.tracks.items()):
+                if identity in seen:
+                    continue
+                if not track['present']:
+                    # Never confirmed, so forget it without an event
+                    del self.tracks[identity]
+                elif now - track['last_seen'] >= self.leave_seconds:
+                    del self.tracks[identity]
+                    events.append({
+                        'event': 'leave',
+                        'name': identity,
+                        'recognized': track['recognized'],
+                        'duration': track['last_seen'] - track['first_seen'],
+                        'timestamp': now
+                    })
+
+            if events:
+                # Only recognized names go to the LLM; strangers are just counted
+                self.present = tuple(
+                    identity for identity, track in self.tracks.items()
+                    if track['present'] and track['recognized']
+                )
+                self.unknown_present = sum(
+                    1 for track in self.tracks.values()
+                    if track['present'] and not track['recognized']
+                )
+
+        return events
+
+    def _identify(self, face, seen, now):
+        """Get the track identity for a face, matching strangers by position"""
+        if face['recognized']:
+            return face['name']
+
+        center = _center(face.get('location'))
+        best, best_distance = None, None
+        for identity, track in self.tracks.items():
+            if track['recognized'] or identity in seen:
+                continue
+            if center is None or track['center'] is None:
+                distance = 0
+            else:
+                distance = math.dist(center, track['center'])
+            if distance <= self.unknown_match_distance and (best is None or distance < best_distance):
+                best, best_distance = identity, distance
+
+        if best is None:
+            best = f"unknown-{next(self.unknown_ids)}"
+        return best
+
+    def _enter_event(self, identity, track, now):
+        """Build an enter event, applying the per-person greeting cooldown"""
+        if not track['recognized']:
+            # Every stranger track is a new person; there is no name to cool down on
+            greet = True
+        else:
+            last_greeted = self.last_greeted.get(identity)
+            greet = last_greeted is None or now - last_greeted >= self.greeting_cooldown
+            if greet:
+                self.last_greeted[identity] = now
+
+        return {
+            'event': 'enter',
+            'name': identity,
+            'recognized': track['recognized'],
+            'greet': greet,
+            'timestamp': now
+        }
+
+    def get_present_people(self):
+        """Get names of recognized people currently present (no vision pass, no locking)"""
+        return self.present
+
+    def get_unknown_count(self):
+        """Get how many unrecognized people are currently present"""
+        return self.unknown_present
+
+    def last_seen(self, identity):
+        """Get the last time an identity was seen, or None"""
+        with self.lock:
+            track = self.tracks.get(identity)
+            return track['last_seen'] if track else None
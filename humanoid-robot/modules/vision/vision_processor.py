@@ -1,28 +1,62 @@
 import threading
-import cv2
-import face_recognition
-from ultralytics import YOLO
-import numpy as np
+import time
 import os
 import pickle
+from modules.vision.presence_tracker import PresenceTracker
+from utils.startup import lazy_import, default_loader, wait_until_ready
+from hal.factory import create_camera
+from utils.tracing import tracer, new_trace
+from utils.metrics import registry
+from utils.supervisor import heartbeat
+
+# Heavy imports happen in the background loader, not at import time
+cv2 = lazy_import('cv2')
+face_recognition = lazy_import('face_recognition')
+ultralytics = lazy_import('ultralytics')
+
+VISION_FPS = registry.gauge('robot_vision_fps', 'Frames per second actually processed by vision')
 
 class VisionProcessor:
-    def __init__(self, output_queue, config):
+    def __init__(self, output_queue, config, world_state=None, loader=None, presence_queue=None):
         self.output_queue = output_queue
+        # Enter/leave events are one-off, so they go on a channel that never drops
+        self.presence_queue = presence_queue if presence_queue is not None else output_queue
         self.config = config
+        self.world_state = world_state
         self.running = False
         
+        # Track who is present across frames
+        self.presence_tracker = PresenceTracker(
+            enter_frames=self.config.PRESENCE_ENTER_FRAMES,
+            leave_seconds=self.config.PRESENCE_LEAVE_SECONDS,
+            greeting_cooldown=self.config.GREETING_COOLDOWN_SECONDS,
+            unknown_match_distance=self.config.PRESENCE_UNKNOWN_MATCH_PIXELS
+        )
+        
+        # Camera and models load in the background; run() waits for them
+        self.camera = None
+        self.known_faces = {'encodings': [], 'names': []}
+        self.object_model = None
+        self.loader = loader or default_loader()
+        self.models_ready = self.loader.submit('vision', self.load_models)
+    
+    def load_models(self):
+        """Import libraries, open the camera and load models (runs in the loader)"""
+        timeline = self.loader.timeline
+        for module in (cv2, face_recognition, ultralytics):
+            timeline.import_module('vision', module)
+        
         # Initialize camera
-        self.camera = cv2.VideoCapture(0)
-        self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-        self.camera.set(cv2.CAP_PROP_FPS, self.config.VISION_PROCESSING_FPS)
+        with timeline.span('vision', 'open camera'):
+            self.camera = create_camera(self.config)
         
         # Load face database
-        self.known_faces = self.load_face_database()
+        with timeline.span('vision', 'load face database'):
+            self.known_faces = self.load_face_database()
         
         # Load object detection model
-        self.object_model = YOLO(self.config.OBJECT_DETECTION_MODEL)
+        with timeline.span('vision', 'load yolo'):
+            self.object_model = ultralytics.YOLO(self.config.OBJECT_DETECTION_MODEL)
         
     def load_face_database(self):
         """Load known faces from database"""
@@ -56,19 +90,49 @@ class VisionProcessor:
         """Run vision processing in a separate thread"""
         self.running = True
         
+        if not wait_until_ready(self.models_ready, "Vision processor", lambda: self.running,
+                                on_wait=lambda: heartbeat('vision')):
+            return
+        
         print("Vision processor started.")
+        last_processed = None
         while self.running:
-            ret, frame = self.camera.read()
+            heartbeat('vision')
+            trace = new_trace('vision')
+            with tracer.span('frame_capture', trace):
+                ret, frame = self.camera.read()
             if not ret:
                 continue
             
             # Process frame at reduced frequency to save CPU
             if int(time.time() * self.config.VISION_PROCESSING_FPS) % 2 == 0:
                 # Detect faces
-                face_results = self.process_faces(frame)
+                with tracer.span('face_recognition', trace):
+                    face_results = self.process_faces(frame)
                 
                 # Detect objects
-                object_results = self.process_objects(frame)
+                with tracer.span('object_detection', trace):
+                    object_results = self.process_objects(frame)
+                
+                # Update presence even when nobody is in frame so leaves are seen
+                now = time.time()
+                if last_processed is not None and now > last_processed:
+                    VISION_FPS.set(1 / (now - last_processed))
+                last_processed = now
+                presence_events = self.presence_tracker.update(face_results['faces'], now)
+                if presence_events and self.world_state is not None:
+                    self.world_state.publish(
+                        people_present=self.presence_tracker.get_present_people(),
+                        unknown_people=self.presence_tracker.get_unknown_count()
+                    )
+                
+                if presence_events:
+                    self.presence_queue.put({
+                        'type': 'presence',
+                        'presence_events': presence_events,
+                        'timestamp': now,
+                        'trace': trace
+                    })
                 
                 # Send results to output queue if anything detected
                 if face_results['faces'] or object_results['objects']:
@@ -76,7 +140,8 @@ class VisionProcessor:
                         'type': 'vision',
                         'faces': face_results['faces'],
                         'objects': object_results['objects'],
-                        'timestamp': time.time()
+                        'timestamp': now,
+                        'trace': trace
                     })
             
             # Sleep to control processing rate
@@ -123,7 +188,7 @@ class VisionProcessor:
     
     def process_objects(self, frame):
         """Process frame for object detection"""
-        results = self.object_model(frame, verbose=False)
+        results = self.object_model(frame, imgsz=self.config.YOLO_INPUT_SIZE, verbose=False)
         
         objects = []
         for result in results:
@@ -142,10 +207,10 @@ class VisionProcessor:
     
     def get_detected_people(self):
         """Get list of currently detected people"""
-        # This would typically use the most recent vision results
-        return []  # Implement based on your needs
+        return self.presence_tracker.get_present_people()
     
     def stop(self):
         """Stop vision processing"""
         self.running = False
-        self.camera.release()
\ No newline at end of file
+        if self.camera is not None:
+            self.camera.release()
\ No newline at end of file
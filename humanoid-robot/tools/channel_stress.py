@@ -0,0 +1,140 @@
+"""Flood the robot's channels and check that memory stays flat.
+
+Producers for every channel publish as fast as they can while a slow
+consumer drains them, the way vision and sensors can outrun main_loop.
+A real SensorManager on the simulated HAL polls flat out while an obstacle
+comes and goes, feeding the emergency channel the way the robot would.
+Exits non-zero if traced memory keeps growing after warm-up, if a bounded
+channel exceeds its capacity, if a never-drop channel lost a message, or
+if obstacles raised more emergencies than there were obstacles (or none).
+
+    python tools/channel_stress.py [seconds]
+"""
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from modules.sensors.sensor_manager import SensorManager
+from utils.channels import create_channels, NEVER_DROP, BLOCK
+
+PAYLOAD = {'faces': [], 'objects': [{'label': 'person', 'bbox': [0.0] * 4}] * 8}
+WARMUP_SECONDS = 1.0
+ALLOWED_GROWTH = 256 * 1024  # Bytes of traced memory growth tolerated after warm-up
+class StressConfig(Config):
+    HAL_BACKEND = 'sim'
+
+# Sensor polls an obstacle stays (and then stays away); long enough for
+# the emergency to clear between obstacles
+OBSTACLE_POLLS = 3 * StressConfig.EMERGENCY_CLEAR_READINGS
+
+def produce(channel, stop):
+    sent = 0
+    while not stop.is_set():
+        try:
+            channel.put(dict(PAYLOAD, seq=sent), timeout=0.1)
+            sent += 1
+        except Exception:
+            # A blocked put timing out is expected under BLOCK
+            pass
+
+def drive_sensors(sensor_manager, stop, counts):
+    """Poll without sleeping while an obstacle toggles every OBSTACLE_POLLS"""
+    polls = 0
+    while not stop.is_set():
+        near = (polls // OBSTACLE_POLLS) % 2 == 1
+        if polls % OBSTACLE_POLLS == 0:
+            sensor_manager.gpio.set_distance(5 if near else 100)
+            counts['obstacles'] += near
+        counts['emergencies'] += sensor_manager.poll_once()
+        polls += 1
+    counts['polls'] = polls
+
+def consume(channels, stop, received):
+    while not stop.is_set():
+        for name, channel in channels.items():
+            try:
+                channel.get_nowait()
+                received[name] += 1
+            except Exception:
+                pass
+        time.sleep(0.001)  # Much slower than the producers
+
+def main():
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    channels = create_channels(StressConfig)
+    # A never-drop channel is only bounded by its consumer, so its
+    # producers are the real ones rather than a flood
+    flooded = {name: c for name, c in channels.items() if c.policy != NEVER_DROP}
+    sensor_manager = SensorManager(
+        channels['sensor'], StressConfig, emergency_queue=channels['emergency']
+    )
+    counts = {'polls': 0, 'obstacles': 0, 'emergencies': 0}
+
+    stop = threading.Event()
+    received = {name: 0 for name in channels}
+
+    tracemalloc.start()
+    threads = [threading.Thread(target=produce, args=(c, stop)) for c in flooded.values()]
+    threads.append(threading.Thread(target=drive_sensors, args=(sensor_manager, stop, counts)))
+    threads.append(threading.Thread(target=consume, args=(channels, stop, received)))
+    for thread in threads:
+        thread.start()
+
+    time.sleep(WARMUP_SECONDS)
+    baseline, _ = tracemalloc.get_traced_memory()
+    samples = []
+    end = time.time() + duration
+    while time.time() < end:
+        time.sleep(0.25)
+        samples.append(tracemalloc.get_traced_memory()[0])
+
+    stop.set()
+    for thread in threads:
+        thread.join()
+    tracemalloc.stop()
+    sensor_manager.stop()
+
+    failures = []
+    growth = max(samples) - baseline
+    print(f"traced memory: baseline {baseline / 1024:.0f} KiB, max growth {growth / 1024:.0f} KiB")
+    if growth > ALLOWED_GROWTH:
+        failures.append(f"memory grew by {growth} bytes")
+
+    for name, channel in channels.items():
+        stats = channel.stats()
+        print(
+            f"{name:10s} {stats['policy']:12s} depth {stats['depth']:4d}/{stats['maxsize']:<4d} "
+            f"high {stats['high_water']:5d} put {stats['put']:8d} "
+            f"dropped {stats['dropped']:8d} blocked {stats['blocked']:6d}"
+        )
+        if channel.policy == NEVER_DROP:
+            if stats['dropped'] or received[name] + stats['depth'] != stats['put']:
+                failures.append(f"{name} lost messages")
+        elif stats['high_water'] > stats['maxsize']:
+            failures.append(f"{name} exceeded its capacity")
+        if channel.policy == BLOCK and stats['dropped']:
+            failures.append(f"{name} dropped messages under BLOCK")
+
+    print(
+        f"sensors: {counts['polls']} polls, {counts['obstacles']} obstacles, "
+        f"{counts['emergencies']} emergencies"
+    )
+    # A noisy echo may hide an obstacle, but must never add an emergency
+    if channels['emergency'].stats()['put'] != counts['emergencies']:
+        failures.append("emergency channel got messages outside emergency onsets")
+    if counts['emergencies'] > counts['obstacles']:
+        failures.append("an obstacle raised more than one emergency")
+    if counts['obstacles'] and not counts['emergencies']:
+        failures.append("no obstacle raised an emergency")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+import threading
+import queue
+from collections import deque
+
+# What a channel does when a producer puts into a full channel
+DROP_OLDEST = 'drop_oldest'  # Discard the oldest message; for telemetry where only the latest matters
+BLOCK = 'block'              # Make the producer wait for space; for commands that must not be lost
+NEVER_DROP = 'never_drop'    # Always accept, even past capacity; for safety-critical messages
+
+POLICIES = (DROP_OLDEST, BLOCK, NEVER_DROP)
+
+class Channel:
+    """Bounded inter-module message channel with an explicit overflow policy.
+
+    Drop-in for the subset of queue.Queue the modules use (put, get,
+    get_nowait, empty, qsize) and raises queue.Empty / queue.Full the same
+    way, but never grows without limit unless the policy is NEVER_DROP.
+    """
+
+    def __init__(self, name, maxsize, policy=BLOCK):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown channel policy: {policy}")
+        if maxsize <= 0:
+            raise ValueError(f"Channel {name} needs a positive maxsize")
+
+        self.name = name
+        self.maxsize = maxsize
+        self.policy = policy
+
+        self.items = deque()
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+        self.not_full = threading.Condition(self.lock)
+
+        # Counters
+        self.put_count = 0
+        self.get_count = 0
+        self.drop_count = 0
+        self.block_count = 0
+        self.high_water = 0
+
+    def put(self, item, block=True, timeout=None):
+        """Put a message, applying the channel policy if it is full"""
+        with self.lock:
+            if len(self.items) >= self.maxsize:
+                if self.policy == DROP_OLDEST:
+                    self.items.popleft()
+                    self.drop_count += 1
+                elif self.policy == BLOCK:
+                    if not block:
+                        raise queue.Full
+                    self.block_count += 1
+                    if not self.not_full.wait_for(
+                        lambda: len(self.items) < self.maxsize, timeout
+                    ):
+                        raise queue.Full
+
+            self.items.append(item)
+            self.put_count += 1
+            self.high_water = max(self.high_water, len(self.items))
+            self.not_empty.notify()
+
+    def put_nowait(self, item):
+        """Put a message without blocking"""
+        self.put(item, block=False)
+
+    def get(self, block=True, timeout=None):
+        """Get the oldest message"""
+        with self.lock:
+            if not self.items:
+                if not block:
+                    raise queue.Empty
+                if not self.not_empty.wait_for(lambda: len(self.items) > 0, timeout):
+                    raise queue.Empty
+
+            item = self.items.popleft()
+            self.get_count += 1
+            self.not_full.notify()
+            return item
+
+    def get_nowait(self):
+        """Get the oldest message without blocking"""
+        return self.get(block=False)
+
+    def empty(self):
+        """Check whether the channel has no messages"""
+        return not self.items
+
+    def qsize(self):
+        """Get the current number of messages"""
+        return len(self.items)
+
+    def stats(self):
+        """Get depth and counters for monitoring"""
+        with self.lock:
+            return {
+                'name': self.name,
+                'policy': self.policy,
+                'depth': len(self.items),
+                'maxsize': self.maxsize,
+                'high_water': self.high_water,
+                'put': self.put_count,
+                'get': self.get_count,
+                'dropped': self.drop_count,
+                'blocked': self.block_count
+            }
+
+def create_channels(config):
+    """Create the robot's channels from Config.CHANNELS"""
+    return {
+        name: Channel(name, maxsize, policy)
+        for name, (maxsize, policy) in config.CHANNELS.items()
+    }
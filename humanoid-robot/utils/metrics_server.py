@@ -0,0 +1,74 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from utils.profiler import SamplingProfiler
+
+MAX_PROFILE_SECONDS = 300
+
+class MetricsServer:
+    """Tiny local HTTP endpoint for fleet monitoring.
+
+    GET /metrics                  Prometheus text format
+    GET /profile?seconds=N        Start an N-second sampling profile; the
+                                  per-thread flamegraph files go to output_dir
+    """
+
+    def __init__(self, registry, host='127.0.0.1', port=9777, profile_dir='profiles'):
+        self.registry = registry
+        self.profile_dir = profile_dir
+        self.profiler = SamplingProfiler()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path == '/metrics':
+                    self.reply(200, server.registry.render(), 'text/plain; version=0.0.4')
+                elif url.path == '/profile':
+                    self.start_profile(parse_qs(url.query))
+                else:
+                    self.reply(404, "Not found\n")
+
+            def start_profile(self, query):
+                try:
+                    seconds = float(query.get('seconds', ['10'])[0])
+                except ValueError:
+                    self.reply(400, "seconds must be a number\n")
+                    return
+                if not 0 < seconds <= MAX_PROFILE_SECONDS:
+                    self.reply(400, f"seconds must be in (0, {MAX_PROFILE_SECONDS}]\n")
+                    return
+
+                if server.profiler.start(seconds, server.profile_dir):
+                    self.reply(202, f"Profiling for {seconds:g}s; output in {server.profile_dir}\n")
+                else:
+                    self.reply(409, "A profile is already running\n")
+
+            def reply(self, status, body, content_type='text/plain'):
+                data = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                # Scrapes every few seconds would flood stdout
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    def start(self):
+        """Serve in a background thread"""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='metrics-server', daemon=True)
+        self.thread.start()
+        host, port = self.httpd.server_address[:2]
+        print(f"Metrics available at http://{host}:{port}/metrics")
+
+    def stop(self):
+        """Stop serving"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,70 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+class SamplingProfiler:
+    """Samples every thread's Python stack at a fixed interval.
+
+    Runs inside the live process, so it can be started on a running robot
+    without restarting it. Output is one folded-stack file per thread
+    ("frame;frame;frame count" lines), which flamegraph.pl, speedscope and
+    inferno all render as a flamegraph.
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.running = False
+
+    def profile(self, seconds):
+        """Sample all threads for `seconds` and return {thread name: Counter of stacks}"""
+        own_thread = threading.get_ident()
+        samples = {}
+        end = time.time() + seconds
+        while time.time() < end:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                name = names.get(thread_id, str(thread_id))
+                samples.setdefault(name, Counter())[';'.join(reversed(stack))] += 1
+            time.sleep(self.interval)
+        return samples
+
+    def dump(self, samples, output_dir):
+        """Write one .folded file per thread and return their paths"""
+        os.makedirs(output_dir, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        paths = []
+        for name, stacks in samples.items():
+            safe_name = ''.join(c if c.isalnum() or c in '-_' else '_' for c in name)
+            path = os.path.join(output_dir, f"{stamp}-{safe_name}.folded")
+            with open(path, 'w') as f:
+                for stack, count in stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+            paths.append(path)
+        return paths
+
+    def start(self, seconds, output_dir):
+        """Profile in the background; returns False if a run is already active"""
+        with self.lock:
+            if self.running:
+                return False
+            self.running = True
+
+        def run():
+            try:
+                paths = self.dump(self.profile(seconds), output_dir)
+                print(f"Profile written: {', '.join(paths)}")
+            finally:
+                self.running = False
+
+        threading.Thread(target=run, name='profiler', daemon=True).start()
+        return True
@@ -0,0 +1,142 @@
+import importlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+
+class LazyModule:
+    """Module proxy that imports on first attribute access.
+
+    Lets a module keep `cv2.VideoCapture(...)` style code while deferring
+    the (often multi-second) import to a background loader.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+def lazy_import(name):
+    """Return a proxy for `name` that is imported on first use"""
+    return LazyModule(name)
+
+class StartupTimeline:
+    """Records how long each component spends importing and loading"""
+
+    def __init__(self):
+        self.start_time = time.time()
+        self.entries = []
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def span(self, component, stage):
+        """Time a startup stage of a component"""
+        start = time.time()
+        try:
+            yield
+        finally:
+            end = time.time()
+            with self.lock:
+                self.entries.append((component, stage, start - self.start_time, end - start))
+
+    def import_module(self, component, module):
+        """Force a lazy import now and record it under `component`"""
+        with self.span(component, f"import {module._name}"):
+            return module._load()
+
+    def report(self):
+        """Format the timeline, ordered by start time"""
+        with self.lock:
+            entries = sorted(self.entries, key=lambda e: e[2])
+
+        lines = ["Startup timeline (start offset, duration):"]
+        for component, stage, offset, duration in entries:
+            lines.append(f"  {offset:7.2f}s  {duration:7.2f}s  {component:8s} {stage}")
+        if entries:
+            finished = max(offset + duration for _, _, offset, duration in entries)
+            lines.append(f"  Startup finished after {finished:.2f}s")
+        return "\n".join(lines)
+
+# Shared by everything started in this process
+startup_timeline = StartupTimeline()
+
+class ModelLoader:
+    """Loads heavy models concurrently in the background.
+
+    submit() returns a readiness future immediately, so module constructors
+    stay cheap and the robot can bring up sensors and motion first.
+    """
+
+    def __init__(self, timeline=None, max_workers=3):
+        self.timeline = timeline or startup_timeline
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='model-loader')
+        self.futures = {}
+
+    def submit(self, component, load):
+        """Run `load()` in the background and return its future"""
+        def run():
+            with self.timeline.span(component, 'total load'):
+                return load()
+
+        future = self.executor.submit(run)
+        self.futures[component] = future
+        return future
+
+    def wait_all(self, timeout=None):
+        """Wait for every submitted load to finish (or fail)"""
+        wait(list(self.futures.values()), timeout=timeout)
+
+    def status(self):
+        """Get 'ready', 'warming up' or 'failed' per component"""
+        return {component: load_status(future) for component, future in self.futures.items()}
+
+    def shutdown(self):
+        """Stop accepting work; in-flight loads finish in the background"""
+        self.executor.shutdown(wait=False)
+
+_default_loader = None
+
+def default_loader():
+    """Get the process-wide loader used when a module isn't given one"""
+    global _default_loader
+    if _default_loader is None:
+        _default_loader = ModelLoader()
+    return _default_loader
+
+def load_status(future):
+    """Get 'ready', 'warming up' or 'failed' for one submitted load"""
+    if not future.done():
+        return 'warming up'
+    if future.exception() is not None:
+        return 'failed'
+    return 'ready'
+
+def wait_until_ready(future, name, is_running, interval=2.0, on_wait=None):
+    """Block a module's run() until its models are loaded.
+
+    Prints a "warming up" notice, and calls `on_wait` if given, every
+    `interval` seconds. Returns False if loading failed or the module was
+    stopped first.
+    """
+    while is_running() and not future.done():
+        print(f"{name} warming up...")
+        if on_wait is not None:
+            on_wait()
+        wait([future], timeout=interval)
+
+    if not future.done():
+        return False
+    if future.exception() is not None:
+        print(f"{name} failed to load: {future.exception()!r}")
+        return False
+    return True
@@ -0,0 +1,175 @@
+import threading
+import time
+
+# The running supervisor, for module loops that report through heartbeat()
+_active = None
+
+def heartbeat(name):
+    """Called by a module loop to show it is still making progress"""
+    if _active is not None:
+        _active.heartbeat(name)
+
+class Supervisor:
+    """Run module threads, restart them with backoff if they crash.
+
+    A crash is an exception escaping the module's run(); a run() that
+    returns normally is treated as a clean exit and is not restarted.
+    A module whose last heartbeat is older than `stall_seconds` is flagged
+    as stalled. It is not restarted: a Python thread can't be killed, and
+    a second run() would race the stuck one over the module's state.
+    """
+
+    def __init__(self, heartbeat_interval=10.0, base_backoff=0.5, max_backoff=30.0,
+                 stable_seconds=60.0, stall_seconds=60.0, channels=None):
+        self.heartbeat_interval = heartbeat_interval
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.stable_seconds = stable_seconds
+        self.stall_seconds = stall_seconds
+        self.channels = channels or {}
+
+        self.workers = {}
+        self.lock = threading.Lock()
+        self.running = False
+        self.monitor_thread = None
+
+    def add(self, name, target):
+        """Register a module loop to supervise"""
+        with self.lock:
+            self.workers[name] = {
+                'target': target,
+                'thread': None,
+                'started_at': None,
+                'last_heartbeat': None,
+                'restarts': 0,
+                'consecutive_crashes': 0,
+                'last_error': None,
+                'crashed': False,
+                'stalled': False,
+                'restart_at': None
+            }
+        if self.running:
+            self._start_worker(name)
+
+    def start(self):
+        """Start all registered modules and the monitor thread"""
+        global _active
+        _active = self
+        self.running = True
+        for name in list(self.workers):
+            self._start_worker(name)
+
+        self.monitor_thread = threading.Thread(target=self.run, name='supervisor', daemon=True)
+        self.monitor_thread.start()
+
+    def _start_worker(self, name):
+        worker = self.workers[name]
+        thread = threading.Thread(target=self._run_worker, args=(name,), name=name, daemon=True)
+        with self.lock:
+            worker['thread'] = thread
+            worker['started_at'] = time.time()
+            worker['last_heartbeat'] = worker['started_at']
+            worker['crashed'] = False
+            worker['stalled'] = False
+            worker['restart_at'] = None
+        thread.start()
+
+    def _run_worker(self, name):
+        worker = self.workers[name]
+        try:
+            worker['target']()
+        except Exception as e:
+            now = time.time()
+            with self.lock:
+                # A module that ran for a while before crashing starts over at the base backoff
+                if now - worker['started_at'] >= self.stable_seconds:
+                    worker['consecutive_crashes'] = 0
+                backoff = min(
+                    self.max_backoff,
+                    self.base_backoff * (2 ** worker['consecutive_crashes'])
+                )
+                worker['consecutive_crashes'] += 1
+                worker['last_error'] = repr(e)
+                worker['crashed'] = True
+                worker['restart_at'] = now + backoff
+            print(f"Module {name} crashed: {e!r}. Restarting in {backoff:.1f}s.")
+
+    def heartbeat(self, name):
+        """Called by a module loop to show it is still making progress"""
+        worker = self.workers.get(name)
+        if worker is not None:
+            worker['last_heartbeat'] = time.time()
+
+    def run(self):
+        """Monitor loop: restart crashed modules, flag stalled ones and report heartbeats"""
+        last_report = time.time()
+        while self.running:
+            now = time.time()
+            for name, worker in list(self.workers.items()):
+                if worker['crashed'] and worker['restart_at'] <= now and self.running:
+                    worker['restarts'] += 1
+                    self._start_worker(name)
+                else:
+                    self._check_stall(name, worker, now)
+
+            if now - last_report >= self.heartbeat_interval:
+                print(self.report())
+                last_report = now
+
+            time.sleep(0.1)
+
+    def _check_stall(self, name, worker, now):
+        thread = worker['thread']
+        if thread is None or not thread.is_alive():
+            return
+        age = now - worker['last_heartbeat']
+        if age >= self.stall_seconds and not worker['stalled']:
+            worker['stalled'] = True
+            print(f"Module {name} stalled: no heartbeat for {age:.1f}s.")
+        elif age < self.stall_seconds and worker['stalled']:
+            worker['stalled'] = False
+            print(f"Module {name} recovered.")
+
+    def status(self):
+        """Get per-module liveness and restart counts"""
+        now = time.time()
+        status = {}
+        with self.lock:
+            for name, worker in self.workers.items():
+                thread = worker['thread']
+                status[name] = {
+                    'alive': thread is not None and thread.is_alive(),
+                    'stalled': worker['stalled'],
+                    'restarts': worker['restarts'],
+                    'last_error': worker['last_error'],
+                    'heartbeat_age': (
+                        now - worker['last_heartbeat'] if worker['last_heartbeat'] else None
+                    )
+                }
+        return status
+
+    def report(self):
+        """Format a one-line-per-item heartbeat report"""
+        lines = ["Heartbeat:"]
+        for name, info in self.status().items():
+            if not info['alive']:
+                state = 'DOWN'
+            elif info['stalled']:
+                state = 'STALLED'
+            else:
+                state = 'alive'
+            lines.append(
+                f"  {name}: {state}, restarts={info['restarts']}, "
+                f"last beat {info['heartbeat_age']:.1f}s ago"
+            )
+        for channel in self.channels.values():
+            stats = channel.stats()
+            lines.append(
+                f"  channel {stats['name']}: depth={stats['depth']}/{stats['maxsize']}, "
+                f"dropped={stats['dropped']}, blocked={stats['blocked']}"
+            )
+        return "\n".join(lines)
+
+    def stop(self):
+        """Stop restarting modules"""
+        self.running = False
@@ -0,0 +1,45 @@
+import os
+import threading
+
+THERMAL_ZONE_PATH = '/sys/class/thermal/thermal_zone0/temp'
+
+def read_cpu_temperature():
+    """SoC temperature in °C, or None if the board doesn't expose it"""
+    try:
+        with open(THERMAL_ZONE_PATH) as f:
+            return int(f.read().strip()) / 1000
+    except (OSError, ValueError):
+        return None
+
+def read_load_average():
+    """1-minute load average divided by CPU count (1.0 = fully busy)"""
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except OSError:
+        return None
+
+def read_rss_bytes():
+    """Resident set size of this process"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        import resource
+        # Peak rather than current RSS, in KiB on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def read_thread_cpu_seconds():
+    """CPU time (user + system) per live Python thread, keyed by thread name"""
+    ticks_per_second = os.sysconf('SC_CLK_TCK')
+    cpu = {}
+    for thread in threading.enumerate():
+        if thread.native_id is None:
+            continue
+        try:
+            with open(f'/proc/self/task/{thread.native_id}/stat') as f:
+                # Fields after the ")" closing the command name; utime/stime are 14/15
+                fields = f.read().rsplit(')', 1)[1].split()
+        except OSError:
+            continue
+        cpu[thread.name] = cpu.get(thread.name, 0) + (int(fields[11]) + int(fields[12])) / ticks_per_second
+    return cpu
@@ -0,0 +1,158 @@
+import itertools
+import json
+import math
+import threading
+import time
+from collections import deque, defaultdict
+from contextlib import contextmanager
+
+_trace_ids = itertools.count(1)
+
+def new_trace(source):
+    """Create trace context to attach to a message where it originates"""
+    return {
+        'trace_id': next(_trace_ids),
+        'source': source,
+        'start': time.perf_counter()
+    }
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, math.ceil(p * len(sorted_values) / 100) - 1))
+    return sorted_values[index]
+
+class Tracer:
+    """Low-overhead span recorder backed by a fixed-size ring.
+
+    Storing a span is a single deque append (atomic under the GIL), so
+    module loops can trace every message without taking a lock. Old spans
+    fall off the end once `capacity` is reached. Listeners (e.g. metrics)
+    see each span as it is recorded.
+    """
+
+    def __init__(self, capacity=20000):
+        self.origin = time.perf_counter()
+        self.spans = deque(maxlen=capacity)
+        self.enabled = True
+        self.listeners = []
+
+    def record(self, stage, trace, start, end, **args):
+        """Record a finished span; `trace` may be None for untraced work"""
+        if not self.enabled:
+            return
+        thread = threading.current_thread()
+        self.spans.append((
+            stage,
+            trace['trace_id'] if trace else 0,
+            start,
+            end,
+            thread.ident,
+            thread.name,
+            args
+        ))
+        for listener in self.listeners:
+            listener(stage, end - start, args)
+
+    def add_listener(self, listener):
+        """Call listener(stage, duration, args) for every recorded span"""
+        self.listeners.append(listener)
+
+    @contextmanager
+    def span(self, stage, trace=None, **args):
+        """Time a block of work as a span"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, trace, start, time.perf_counter(), **args)
+
+    def finish(self, trace):
+        """Record the source-to-here latency of a trace as end_to_end:<source>"""
+        if trace:
+            self.record(f"end_to_end:{trace['source']}", trace, trace['start'], time.perf_counter())
+
+    def summary(self):
+        """Get count and p50/p95/p99/max in milliseconds per stage"""
+        durations = defaultdict(list)
+        for stage, _, start, end, _, _, _ in list(self.spans):
+            durations[stage].append((end - start) * 1000)
+
+        summary = {}
+        for stage, values in durations.items():
+            values.sort()
+            summary[stage] = {
+                'count': len(values),
+                'p50': percentile(values, 50),
+                'p95': percentile(values, 95),
+                'p99': percentile(values, 99),
+                'max': values[-1]
+            }
+        return summary
+
+    def format_summary(self):
+        """Format the per-stage latency summary as a table"""
+        summary = self.summary()
+        if not summary:
+            return "No trace spans recorded."
+
+        lines = [f"{'stage':28s} {'count':>7s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'max ms':>9s}"]
+        for stage in sorted(summary):
+            s = summary[stage]
+            lines.append(
+                f"{stage:28s} {s['count']:7d} {s['p50']:9.1f} {s['p95']:9.1f} "
+                f"{s['p99']:9.1f} {s['max']:9.1f}"
+            )
+        return "\n".join(lines)
+
+    def to_chrome_trace(self):
+        """Convert spans to Chrome trace events (chrome://tracing, Perfetto)"""
+        events = []
+        thread_names = {}
+        for stage, trace_id, start, end, thread_id, thread_name, args in list(self.spans):
+            thread_names[thread_id] = thread_name
+            events.append({
+                'name': stage,
+                'cat': 'robot',
+                'ph': 'X',
+                'ts': (start - self.origin) * 1e6,
+                'dur': (end - start) * 1e6,
+                'pid': 1,
+                'tid': thread_id,
+                'args': dict(args, trace_id=trace_id)
+            })
+
+        for thread_id, thread_name in thread_names.items():
+            events.append({
+                'name': 'thread_name',
+                'ph': 'M',
+                'pid': 1,
+                'tid': thread_id,
+                'args': {'name': thread_name}
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, path):
+        """Write spans as a Chrome trace JSON file"""
+        with open(path, 'w') as f:
+            json.dump(self.to_chrome_trace(), f)
+
+    def export_json(self, path):
+        """Write raw spans and the summary as JSON"""
+        spans = [
+            {
+                'stage': stage,
+                'trace_id': trace_id,
+                'start': start - self.origin,
+                'duration': end - start,
+                'thread': thread_name,
+                'args': args
+            }
+            for stage, trace_id, start, end, _, thread_name, args in list(self.spans)
+        ]
+        with open(path, 'w') as f:
+            json.dump({'spans': spans, 'summary': self.summary()}, f, indent=2)
+
+# Shared by all modules in this process
+tracer = Tracer()
@@ -0,0 +1,63 @@
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
+# An immutable, versioned view of everything the robot currently knows.
+# `data` is a read-only mapping, so a snapshot can be handed to any thread.
+WorldSnapshot = namedtuple('WorldSnapshot', ['version', 'timestamp', 'data'])
+
+class WorldState:
+    """Versioned copy-on-write blackboard shared by all modules.
+
+    Producers call publish() with the keys they own; each publish builds a
+    new snapshot and swaps it in with a single reference assignment. Readers
+    just take `current()` and never lock, so they always see one consistent
+    version even while producers are writing.
+    """
+
+    def __init__(self, initial=None):
+        # Serializes producers only; readers never take it
+        self.write_lock = threading.Lock()
+        self.version_changed = threading.Condition(self.write_lock)
+
+        self.snapshot = WorldSnapshot(0, time.time(), MappingProxyType(dict(initial or {})))
+
+    def current(self):
+        """Get the latest snapshot (lock-free)"""
+        return self.snapshot
+
+    def get(self, key, default=None):
+        """Read a single key from the latest snapshot"""
+        return self.snapshot.data.get(key, default)
+
+    def publish(self, **updates):
+        """Publish new values for some keys and return the new version"""
+        with self.write_lock:
+            data = dict(self.snapshot.data)
+            data.update(updates)
+
+            self.snapshot = WorldSnapshot(
+                self.snapshot.version + 1,
+                time.time(),
+                MappingProxyType(data)
+            )
+            self.version_changed.notify_all()
+
+            return self.snapshot.version
+
+    def wait_for_version(self, version, timeout=None):
+        """Block until a snapshot newer than `version` exists and return it
+
+        Returns the current snapshot on timeout, which callers can detect by
+        comparing its version.
+        """
+        snapshot = self.snapshot
+        if snapshot.version > version:
+            return snapshot
+
+        with self.version_changed:
+            self.version_changed.wait_for(
+                lambda: self.snapshot.version > version, timeout
+            )
+            return self.snapshot